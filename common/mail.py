@@ -0,0 +1,160 @@
+import smtplib
+import sys
+import threading
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class TransientMailError(Exception):
+    """
+    Mail couldn't be sent for a reason that may go away, worth retrying.
+    """
+
+
+def raise_if_transient(error):
+    """
+    Raises TransientMailError if SMTP server refused with a 4xx reply.
+    """
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in error.recipients.values()]
+    else:
+        codes = [error.smtp_code]
+    if codes and all(400 <= code < 500 for code in codes):
+        raise TransientMailError(str(error)) from error
+
+
+def close_connection(connection):
+    try:
+        connection.quit()
+    except (smtplib.SMTPException, OSError):
+        connection.close()
+
+
+class BaseTransport(object):
+    """
+    Sends already built messages, subclasses decide where to.
+    """
+
+    def send(self, username, password, to_mail, message):
+        raise NotImplementedError
+
+
+class SMTPTransport(BaseTransport):
+    """
+    Sends mails over SMTP, keeping one logged in connection per mailbox
+    open in the process so that consecutive mails skip connect and login.
+    """
+    _connections = {}
+    _lock = threading.Lock()
+
+    def __init__(self, host=None, port=None, timeout=None, login=True):
+        self.host = host or settings.EMAIL_HOST
+        self.port = port or settings.EMAIL_PORT
+        self.timeout = timeout or settings.EMAIL_TIMEOUT
+        self.login = login
+
+    def get_connection(self, username, password):
+        key = (self.host, self.port, username)
+        with self._lock:
+            connection = self._connections.pop(key, None)
+        if connection is None:
+            connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.login:
+                try:
+                    connection.login(username, password)
+                except smtplib.SMTPException:
+                    connection.close()
+                    raise
+        return key, connection
+
+    def release_connection(self, key, connection):
+        with self._lock:
+            if key not in self._connections:
+                self._connections[key] = connection
+                return
+        # another thread already pooled its connection
+        close_connection(connection)
+
+    def send(self, username, password, to_mail, message):
+        # idle pooled connection may have been dropped by the server,
+        # so sending is tried once more on a fresh one
+        for attempt in range(2):
+            try:
+                key, connection = self.get_connection(username, password)
+            except smtplib.SMTPResponseException as e:
+                raise_if_transient(e)
+                raise
+            except OSError as e:
+                raise TransientMailError(str(e)) from e
+
+            try:
+                connection.sendmail(username, to_mail, message)
+            except smtplib.SMTPServerDisconnected as e:
+                connection.close()
+                if attempt:
+                    raise TransientMailError(str(e)) from e
+                continue
+            except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused) as e:
+                # connection is still usable after server refused the mail
+                self.release_connection(key, connection)
+                raise_if_transient(e)
+                raise
+            except OSError as e:
+                connection.close()
+                raise TransientMailError(str(e)) from e
+            self.release_connection(key, connection)
+            return
+
+    @classmethod
+    def close_all(cls):
+        with cls._lock:
+            connections, cls._connections = list(cls._connections.values()), {}
+        for connection in connections:
+            close_connection(connection)
+
+
+class ConsoleTransport(BaseTransport):
+    """
+    Writes mails to standard output.
+    """
+
+    def send(self, username, password, to_mail, message):
+        sys.stdout.write(f'From: {username}\nTo: {", ".join(to_mail)}\n{message}\n{"-" * 79}\n')
+        sys.stdout.flush()
+
+
+class FileTransport(BaseTransport):
+    """
+    Writes every mail to its own .eml file in EMAIL_FILE_PATH.
+    """
+
+    def send(self, username, password, to_mail, message):
+        path = Path(settings.EMAIL_FILE_PATH)
+        path.mkdir(parents=True, exist_ok=True)
+        (path / f'{uuid.uuid4().hex}.eml').write_text(message)
+
+
+class InMemoryTransport(BaseTransport):
+    """
+    Keeps mails in InMemoryTransport.outbox, for tests.
+    """
+    outbox = []
+
+    def send(self, username, password, to_mail, message):
+        self.outbox.append(
+            {
+                'from_mail': username,
+                'to_mail': list(to_mail),
+                'message': message,
+            }
+        )
+
+
+def get_transport():
+    """
+    Returns transport selected by EMAIL_TRANSPORT setting.
+    """
+    return import_string(settings.EMAIL_TRANSPORT)()
@@ -0,0 +1,84 @@
+import socket
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from common.mail import SMTPTransport
+from common.tasks import build_message
+from newsletter.models import Newsletter, Subscriber
+from newsletter.tasks import get_newsletter_html
+from orders.emails import render_email, get_order_mail_context
+from orders.models import Order
+
+
+class Command(BaseCommand):
+    help = (
+        'Sends templated order or newsletter mails to a local aiosmtpd server '
+        'and reports messages per second, with a connection per mail and pooled.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=200)
+        parser.add_argument('--kind', choices=('order', 'newsletter'), default='newsletter')
+
+    def handle(self, *args, **options):
+        try:
+            from aiosmtpd.controller import Controller
+            from aiosmtpd.handlers import Sink
+        except ImportError:
+            raise CommandError('aiosmtpd is needed to run the benchmark: pip install aiosmtpd')
+
+        render = self.get_renderer(options['kind'])
+        port = self.get_free_port()
+        controller = Controller(Sink(), hostname='127.0.0.1', port=port)
+        controller.start()
+        try:
+            for label, pooled in (('connection per mail', False), ('pooled connection', True)):
+                transport = SMTPTransport(host='127.0.0.1', port=port, login=False)
+                started = time.perf_counter()
+                for i in range(options['count']):
+                    subject, html_content, to_mail = render(i)
+                    msg = build_message(subject, None, html_content, to_mail, 'benchmark@localhost')
+                    transport.send('benchmark@localhost', None, to_mail, msg.as_string())
+                    if not pooled:
+                        SMTPTransport.close_all()
+                elapsed = time.perf_counter() - started
+                SMTPTransport.close_all()
+                self.stdout.write(
+                    f'{label}: {options["count"]} mails in {elapsed:.2f}s, '
+                    f'{options["count"] / elapsed:.1f} messages/sec'
+                )
+        finally:
+            controller.stop()
+
+    def get_free_port(self):
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            return sock.getsockname()[1]
+
+    def get_renderer(self, kind):
+        """
+        Returns function that renders i-th mail as (subject, html, recipients).
+        """
+        if kind == 'order':
+            order_id = Order.objects.filter(products__isnull=False).values_list('id', flat=True).first()
+            if order_id is None:
+                raise CommandError('There are no orders to render order mails from.')
+            context = get_order_mail_context(order_id)
+            return lambda i: (
+                'Your order has been created successfully.',
+                render_email('order_created.html', context),
+                [f'customer{i}@localhost'],
+            )
+
+        newsletter = Newsletter.objects.order_by('-id').first()
+        if newsletter is None:
+            raise CommandError('There are no newsletters to render newsletter mails from.')
+        return lambda i: (
+            newsletter.email_subject,
+            get_newsletter_html(
+                newsletter.content,
+                Subscriber(email=f'subscriber{i}@localhost', code=str(i))
+            ),
+            [f'subscriber{i}@localhost'],
+        )
@@ -0,0 +1,9 @@
+import redis
+from django.conf import settings
+
+# connect to redis-db
+redis_connection = redis.Redis(
+    host=settings.REDIS_HOST,
+    port=settings.REDIS_PORT,
+    db=settings.REDIS_DB
+)
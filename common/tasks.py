@@ -1,17 +1,21 @@
 from celery import shared_task
 from decouple import config
-import smtplib
 import email
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
+from .mail import TransientMailError, get_transport
+
+
 @shared_task(name="sum_two_numbers")
 def add(x, y):
     return x + y
 
 
-@shared_task
-def send_email(subject,message,html_content,to_mail,from_mail):
+def get_mail_credentials(from_mail):
+    """
+    Returns username and password of the mailbox mail is sent from.
+    """
     username=from_mail
     if from_mail=="order@mail.akku.gg":
         password=config('ORDER_MAIL_PASSWORD',cast=str)
@@ -24,37 +28,39 @@ def send_email(subject,message,html_content,to_mail,from_mail):
     else:
         username='akku@mail.akku.gg'
         password=config('DEFAULT_MAIL_PASSWORD')
+    return username, password
+
 
-    rcptto=to_mail
+def build_message(subject, message, html_content, to_mail, username):
+    """
+    Returns multipart message with plain text and html alternatives.
+    """
     msg = MIMEMultipart('alternative')
     msg['Subject'] = subject
     msg['From'] = f"AKKU<{username}>"
 
-    msg['To'] = ", ".join(rcptto)
+    msg['To'] = ", ".join(to_mail)
     msg['Message-id'] = email.utils.make_msgid()
-    msg['Date'] = email.utils.formatdate() 
-    textplain = MIMEText(message, _subtype='plain', _charset='UTF-8')
-    msg.attach(textplain)
+    msg['Date'] = email.utils.formatdate()
+    if message:
+        textplain = MIMEText(message, _subtype='plain', _charset='UTF-8')
+        msg.attach(textplain)
     texthtml = MIMEText(html_content, _subtype='html', _charset='UTF-8')
     msg.attach(texthtml)
-    try:
-        client = smtplib.SMTP()
-        client.connect('smtpdm-ap-southeast-1.aliyun.com', 80)
-        client.set_debuglevel(0)
-        client.login(username, password)
-        client.sendmail(username, rcptto, msg.as_string())
-        client.quit()
-    except smtplib.SMTPConnectError as e:
-        print('Mail delivery fails, the connection fails:', e.smtp_code, e.smtp_error)
-    except smtplib.SMTPAuthenticationError as e:
-        print('Mail delivery failure, certification error:', e.smtp_code, e.smtp_error)
-    except smtplib.SMTPSenderRefused as e:
-        print('Send mail failed, the sender is rejected:', e.smtp_code, e.smtp_error)
-    except smtplib.SMTPRecipientsRefused as e:
-        print('Send mail failed, the recipient was rejected:', e.smtp_code, e.smtp_error)
-    except smtplib.SMTPDataError as e:
-        print('Send mail failed, data reception to refuse:', e.smtp_code, e.smtp_error)
-    except smtplib.SMTPException as e:
-        print('Send mail failed, ', e.message)
-    except Exception as e:
-        print('Send mail abnormal, ', str(e))
\ No newline at end of file
+    return msg
+
+
+@shared_task(
+    autoretry_for=(TransientMailError,),
+    retry_backoff=True,
+    retry_backoff_max=60 * 10,
+    retry_kwargs={'max_retries': 5},
+)
+def send_email(subject,message,html_content,to_mail,from_mail):
+    """
+    Sends mail through EMAIL_TRANSPORT, retrying with backoff when the
+    failure is transient and raising otherwise.
+    """
+    username, password = get_mail_credentials(from_mail)
+    msg = build_message(subject, message, html_content, to_mail, username)
+    get_transport().send(username, password, to_mail, msg.as_string())
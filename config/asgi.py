@@ -13,4 +13,16 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# imported once django is set up
+from notifications.stream import NOTIFICATION_STREAM_PATH, notification_stream  # noqa: E402
+
+
+async def application(scope, receive, send):
+    """
+    Serves live notification stream, everything else is handled by django.
+    """
+    if scope['type'] == 'http' and scope['path'] == NOTIFICATION_STREAM_PATH:
+        return await notification_stream(scope, receive, send)
+    return await django_application(scope, receive, send)
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
 from pathlib import Path
+from celery.schedules import crontab
 from decouple import config
 from datetime import timedelta
 from .jazzmin import *
@@ -197,6 +198,28 @@ CELERY_ACCEPT_CONTENT = ['application/json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'Asia/Kathmandu'
+CELERY_BEAT_SCHEDULE = {
+    'flush-product-views-count': {
+        'task': 'products.tasks.flush_product_views_count',
+        'schedule': 60.0,
+    },
+    'refresh-top-selling-products': {
+        'task': 'products.tasks.refresh_top_selling_products',
+        'schedule': 60.0 * 10,
+    },
+    'build-co-purchase-neighbours': {
+        'task': 'products.tasks.build_co_purchase_neighbours',
+        'schedule': crontab(hour=3, minute=0),
+    },
+    'rebuild-dirty-dashboard-rollups': {
+        'task': 'dashboard.tasks.rebuild_dirty_dashboard_rollups',
+        'schedule': 60.0,
+    },
+    'rebuild-recent-dashboard-rollups': {
+        'task': 'dashboard.tasks.rebuild_recent_dashboard_rollups',
+        'schedule': 60.0 * 15,
+    },
+}
 
 
 # JWT Configuration
@@ -237,6 +260,28 @@ REDIS_PORT=6379
 REDIS_DB=1
 
 
+# email
+# transport mails are sent through, one of common.mail.SMTPTransport,
+# ConsoleTransport, FileTransport or InMemoryTransport
+EMAIL_TRANSPORT = config('EMAIL_TRANSPORT', default='common.mail.SMTPTransport')
+EMAIL_HOST = config('EMAIL_HOST', default='smtpdm-ap-southeast-1.aliyun.com')
+EMAIL_PORT = config('EMAIL_PORT', default=80, cast=int)
+EMAIL_TIMEOUT = config('EMAIL_TIMEOUT', default=30, cast=int)
+EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+
+
+# cache
+CACHES = {
+    'default': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': f'redis://{REDIS_HOST}:{REDIS_PORT}/2',
+        'OPTIONS': {
+            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+        },
+    }
+}
+
+
 # aws
 AWS_ACCESS_KEY_ID = config('AWS_ACCESS_KEY_ID')
 AWS_SECRET_ACCESS_KEY = config('AWS_SECRET_ACCESS_KEY')
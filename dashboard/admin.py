@@ -1,3 +1,24 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import DailyPaymentMethodSales, DailyCategorySales, DailyProductSales
+
+
+@admin.register(DailyPaymentMethodSales)
+class DailyPaymentMethodSalesAdmin(admin.ModelAdmin):
+    list_display = ('id', 'date', 'method', 'amount', 'payments_count',)
+    list_filter = ('method',)
+    date_hierarchy = 'date'
+
+
+@admin.register(DailyCategorySales)
+class DailyCategorySalesAdmin(admin.ModelAdmin):
+    list_display = ('id', 'date', 'category', 'orders_count', 'sales',)
+    list_filter = ('category',)
+    date_hierarchy = 'date'
+
+
+@admin.register(DailyProductSales)
+class DailyProductSalesAdmin(admin.ModelAdmin):
+    list_display = ('id', 'date', 'product', 'orders_count', 'units', 'sales',)
+    raw_id_fields = ('product',)
+    date_hierarchy = 'date'
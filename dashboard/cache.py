@@ -0,0 +1,58 @@
+import time
+from django.core.cache import cache
+from django.db import transaction
+
+from .helpers.accounting import get_accounting_data
+from .helpers.overview import get_overview_data
+
+# dashboard responses by name, each computed from the date they are for.
+# add a view's data function here to cache it.
+DASHBOARD_RESPONSES = {
+    'overview': get_overview_data,
+    'accounting': get_accounting_data,
+}
+# seconds a cached response is served as is, after that it is still
+# served while being recomputed in background
+DASHBOARD_CACHE_FRESH_FOR = 60
+# seconds a cached response is kept at all
+DASHBOARD_CACHE_TIMEOUT = 60 * 10
+# seconds a response may take to be computed before another request or
+# worker computes it too
+DASHBOARD_CACHE_LOCK_TIMEOUT = 30
+DASHBOARD_VERSION_KEY = 'dashboard:version'
+
+
+def get_dashboard_version():
+    return cache.get_or_set(DASHBOARD_VERSION_KEY, time.time_ns, None)
+
+
+def get_dashboard_key(name, date, version):
+    return f'dashboard:{name}:{date.isoformat()}:{version}'
+
+
+def get_dashboard_lock_key(name, date, version):
+    return f'{get_dashboard_key(name, date, version)}:lock'
+
+
+def store_dashboard_response(name, date, version):
+    """
+    Computes response of dashboard name for date and caches it under the
+    given version.
+    """
+    data = DASHBOARD_RESPONSES[name](date)
+    cache.set(
+        get_dashboard_key(name, date, version),
+        {'data': data, 'fresh_until': time.time() + DASHBOARD_CACHE_FRESH_FOR},
+        DASHBOARD_CACHE_TIMEOUT
+    )
+    return data
+
+
+def invalidate_dashboard_cache():
+    """
+    Discards cached responses of all dashboards once the current
+    transaction commits.
+    """
+    transaction.on_commit(
+        lambda: cache.set(DASHBOARD_VERSION_KEY, time.time_ns(), None)
+    )
@@ -0,0 +1,129 @@
+import csv
+import datetime
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework import serializers
+
+from orders.models import Order, OrderProduct
+from payments.models import Payment
+from .helpers.dates import get_datetime_range
+
+# rows fetched from the database at a time while streaming an export
+EXPORT_CHUNK_SIZE = 2000
+
+# columns of each export as (header, field)
+ORDER_COLUMNS = [
+    ('order uuid', 'order_uuid'),
+    ('created on', 'created_on'),
+    ('customer', 'user__email'),
+    ('delivery status', 'delivery_status'),
+    ('delivered at', 'delivered_at'),
+    ('sub total', 'sub_total'),
+    ('discount', 'discount'),
+    ('delivery charge', 'delivery_charge'),
+    ('vat', 'vat'),
+    ('final price', 'final_price'),
+    ('reward points', 'reward_points'),
+    ('payment uuid', 'payment__payment_uuid'),
+    ('payment method', 'payment__method__method_name'),
+    ('payment status', 'payment__payment_status'),
+]
+ORDER_LINE_COLUMNS = [
+    ('order uuid', 'order__order_uuid'),
+    ('created on', 'created_on'),
+    ('customer', 'user__email'),
+    ('product id', 'product_id'),
+    ('product', 'product__name'),
+    ('color', 'color'),
+    ('quantity', 'quantity'),
+    ('rate', 'rate'),
+    ('net total', 'net_total'),
+    ('delivery status', 'delivery_status'),
+    ('delivered at', 'delivered_at'),
+]
+PAYMENT_COLUMNS = [
+    ('payment uuid', 'payment_uuid'),
+    ('created on', 'created_on'),
+    ('customer', 'user__email'),
+    ('method', 'method__method_name'),
+    ('amount', 'amount'),
+    ('currency', 'currency'),
+    ('payment status', 'payment_status'),
+    ('status code', 'status_code'),
+    ('order assigned', 'order_assigned'),
+]
+
+# exports by name as (model, columns)
+EXPORTS = {
+    'orders': (Order, ORDER_COLUMNS),
+    'order-lines': (OrderProduct, ORDER_LINE_COLUMNS),
+    'payments': (Payment, PAYMENT_COLUMNS),
+}
+
+
+class Echo(object):
+    """
+    File-like object that returns what is written, so that csv.writer
+    rows can be yielded instead of buffered.
+    """
+
+    def write(self, value):
+        return value
+
+
+def get_export_date(value, param):
+    """
+    Raises validation error or returns date parsed from YYYY-MM-DD value.
+    """
+    try:
+        date = parse_date(value or '')
+    except ValueError:
+        date = None
+    if date is None:
+        raise serializers.ValidationError(
+            {
+                'error_message': [
+                    f"{param} is required in YYYY-MM-DD format."
+                ]
+            },
+            code='invalid_date'
+        )
+    return date
+
+
+# first characters that make spreadsheets read a cell as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def format_value(value):
+    if isinstance(value, datetime.datetime):
+        return timezone.localtime(value).isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        # user entered text is exported as text, never as a formula
+        return f"'{value}"
+    return value
+
+
+def get_export_rows(export_name, start_date, end_date):
+    """
+    Streams header and rows of export created from start_date to end_date
+    (both included), reading the database in chunks.
+    """
+    model, columns = EXPORTS[export_name]
+    start, end = get_datetime_range(start_date, end_date)
+    rows = (
+        model.objects
+        .filter(created_on__gte=start, created_on__lt=end)
+        .order_by('created_on')
+        .values_list(*[field for _, field in columns])
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    yield [header for header, _ in columns]
+    for row in rows:
+        yield [format_value(value) for value in row]
+
+
+def stream_csv(rows):
+    writer = csv.writer(Echo())
+    for row in rows:
+        yield writer.writerow(row)
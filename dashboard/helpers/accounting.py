@@ -0,0 +1,176 @@
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.db.models import F, Q, Sum
+
+from orders.models import Order
+from products.models import Product
+from dashboard.models import DailyPaymentMethodSales, DailyCategorySales, DailyProductSales
+from dashboard.helpers.payment_methods import (
+    get_sales_data_according_to_payment_method_from_to,
+)
+
+User = get_user_model()
+
+# days of "last 7 days" figures, today included
+WEEK_DAYS = 7
+
+
+def get_week_dates(today):
+    return [today - timedelta(days=days_ago) for days_ago in reversed(range(WEEK_DAYS))]
+
+
+def get_daily_sums(field, week_dates):
+    """
+    Returns conditional sums of field, one per day of the week, so that
+    daily figures come out of the same statement as the totals.
+    """
+    return {
+        f'day_{i}': Sum(field, filter=Q(date=date))
+        for i, date in enumerate(week_dates)
+    }
+
+
+def get_daily_rows(figures, week_dates, value_name):
+    """
+    Returns [{'date': date, value_name: value}] of days that have figures.
+    """
+    return [
+        {'date': date, value_name: figures[f'day_{i}']}
+        for i, date in enumerate(week_dates)
+        if figures[f'day_{i}'] is not None
+    ]
+
+
+def get_sales_summary(today):
+    """
+    Returns total sales, sales of today and of each of the last 7 days
+    with a single query.
+    """
+    week_dates = get_week_dates(today)
+    figures = DailyPaymentMethodSales.objects.aggregate(
+        total_sales=Sum('amount'),
+        sales_today=Sum('amount', filter=Q(date=today)),
+        **get_daily_sums('amount', week_dates)
+    )
+    return {
+        'total_sales': figures['total_sales'],
+        'sales_today': figures['sales_today'] or 0.00,
+        'weekly_sales': get_daily_rows(figures, week_dates, 'sum'),
+    }
+
+
+def get_orders_summary(today):
+    """
+    Returns ordered products of today and of each of the last 7 days
+    with a single query.
+    """
+    week_dates = get_week_dates(today)
+    figures = (
+        DailyProductSales.objects
+        .filter(date__range=(week_dates[0], today))
+        .aggregate(
+            orders_today=Sum('orders_count', filter=Q(date=today)),
+            **get_daily_sums('orders_count', week_dates)
+        )
+    )
+    return {
+        'orders_today': figures['orders_today'] or 0,
+        'order_data_for_last_seven_days': get_daily_rows(figures, week_dates, 'count'),
+    }
+
+
+def get_best_selling_products_summary(today):
+    """
+    Returns today's and last 7 days' best selling products with a single
+    query.
+    """
+    week_dates = get_week_dates(today)
+    products = (
+        DailyProductSales.objects
+        .filter(date__range=(week_dates[0], today), product__isnull=False)
+        .order_by()
+        .values(name=F('product__name'), sub_category_name=F('product__sub_category__name'))
+        .annotate(
+            sold_count_today=Sum('orders_count', filter=Q(date=today)),
+            sold_count=Sum('orders_count'),
+        )
+        .order_by('-sold_count')
+    )
+    todays_best_selling, weeks_best_selling = [], []
+    for product in products:
+        row = {'name': product['name'], 'sub_category__name': product['sub_category_name']}
+        weeks_best_selling.append({**row, 'sold_count': product['sold_count']})
+        if product['sold_count_today']:
+            todays_best_selling.append({**row, 'sold_count': product['sold_count_today']})
+    todays_best_selling.sort(key=lambda product: product['sold_count'], reverse=True)
+    return {
+        'todays_best_selling_product': todays_best_selling,
+        'weeks_best_selling_product': weeks_best_selling,
+    }
+
+
+def get_category_pie_charts(start_date, end_date):
+    """
+    Returns sales and ordered products per category with a single query.
+    """
+    categories = list(
+        DailyCategorySales.objects
+        .filter(date__range=(start_date, end_date), category__isnull=False)
+        .order_by()
+        .values(name=F('category__name'))
+        .annotate(sales=Sum('sales'), order_count=Sum('orders_count'))
+    )
+    return {
+        'sales_pie_chart': [
+            {'name': category['name'], 'sales': category['sales']} for category in categories
+        ],
+        'orders_pie_chart': [
+            {'name': category['name'], 'order_count': category['order_count']} for category in categories
+        ],
+    }
+
+
+def get_accounting_data(today):
+    """
+    Returns sales, orders, best selling products and category figures of
+    today and of the last 7 days.
+    """
+    products_count = Product.objects.count()
+    orders_count = Order.objects.count()
+    customers_count = User.objects.filter(is_staff=False, is_superuser=False).count()
+
+    sales_summary = get_sales_summary(today)
+    orders_summary = get_orders_summary(today)
+    best_selling_products = get_best_selling_products_summary(today)
+
+    # Piechart - Today
+    pie_charts = get_category_pie_charts(today, today)
+
+    return {
+        # First Row
+        'total_sales': sales_summary['total_sales'],
+        "products": products_count,
+        'orders': orders_count,
+        'customers': customers_count,
+
+        # Second row
+        'weekly_sales': sales_summary['weekly_sales'],
+
+        # Third row : Left
+        'sales_today': sales_summary['sales_today'],
+        'orders_today': orders_summary['orders_today'],
+        'sales_today_pie_chart': pie_charts['sales_pie_chart'],
+        'orders_today_pie_chart': pie_charts['orders_pie_chart'],
+
+        # Third Row: Right
+        'todays_best_selling_product': best_selling_products['todays_best_selling_product'],
+        'weeks_best_selling_product': best_selling_products['weeks_best_selling_product'],
+
+        # Fourth  Row
+        'order_data_for_last_seven_days': orders_summary['order_data_for_last_seven_days'],
+
+        # Fifth Row
+        'sales_according_to_payment_method_for_last_seven_days': list(
+            get_sales_data_according_to_payment_method_from_to(today - timedelta(days=6), today)
+        ),
+    }
@@ -0,0 +1,16 @@
+from datetime import datetime, time, timedelta
+from django.utils import timezone
+
+
+def get_datetime_range(start_date, end_date=None):
+    """
+    Returns aware datetimes [start, end) covering start_date to end_date
+    (both included) in the current time zone, to filter datetime columns
+    with created_on__gte / created_on__lt instead of created_on__date,
+    which casts the column and can't use its index.
+    """
+    end_date = end_date or start_date
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(start_date, time.min), tz)
+    end = timezone.make_aware(datetime.combine(end_date + timedelta(days=1), time.min), tz)
+    return start, end
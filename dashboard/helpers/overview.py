@@ -0,0 +1,54 @@
+from datetime import timedelta
+from django.db.models import Count, Q, Sum
+
+from orders.models import Order, OrderProduct
+from payments.models import Payment
+from dashboard.helpers.dates import get_datetime_range
+from dashboard.helpers.sales import get_sales_data
+
+
+def get_overview_data(today):
+    """
+    Returns today's earnings, orders and products meta data and sales of
+    the last 7 days.
+    """
+    today_start, today_end = get_datetime_range(today)
+
+    # Todays earning
+    todays_earnings = (
+        Payment.objects.filter(
+            payment_status='verified',
+            created_on__gte=today_start,
+            created_on__lt=today_end,
+        )
+        .aggregate(todays_earnings=Sum('amount'))
+        .get('todays_earnings') or 0.00
+    )
+
+    # products and orders metadata.
+    products_sold_today = OrderProduct.objects.filter(
+        delivered_at=today,
+        delivery_status='Completed'
+    ).count()
+    received_today = Q(created_on__gte=today_start, created_on__lt=today_end)
+    pending = Q(delivery_status='Pending')
+    # only today's and pending orders are read, through their indexes
+    orders_metadata = Order.objects.filter(received_today | pending).aggregate(
+        orders_received_today=Count('id', filter=received_today),
+        pending_order=Count('id', filter=pending),
+    )
+
+    return {
+        # Earnings
+        'todays_earnings': todays_earnings,
+
+        # Products
+        'products_sold_today': products_sold_today,
+
+        # Orders
+        'orders_received_today': orders_metadata['orders_received_today'],
+        'pending_order': orders_metadata['pending_order'],
+
+        # weekly sales
+        'weekly_sales': list(get_sales_data(today - timedelta(days=6), today)),
+    }
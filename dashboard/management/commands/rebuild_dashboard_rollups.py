@@ -0,0 +1,37 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Min
+from django.utils import timezone
+
+from dashboard.rollups import rebuild_daily_rollups
+from orders.models import OrderProduct
+from payments.models import Payment
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds dashboard daily rollups, of every day since the first payment or order by default.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Rebuild only the last given number of days.')
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        if options['days']:
+            start_date = today - timedelta(days=options['days'] - 1)
+        else:
+            first_created_on = [
+                Payment.objects.aggregate(first=Min('created_on'))['first'],
+                OrderProduct.objects.aggregate(first=Min('created_on'))['first'],
+            ]
+            first_created_on = [created_on for created_on in first_created_on if created_on]
+            if not first_created_on:
+                self.stdout.write('Nothing to rebuild.')
+                return
+            start_date = timezone.localdate(min(first_created_on))
+
+        day = start_date
+        while day <= today:
+            rebuild_daily_rollups(day)
+            day += timedelta(days=1)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt dashboard rollups from {start_date} to {today}.'))
@@ -0,0 +1,69 @@
+# Generated by Django 3.2 on 2026-10-18 17:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('core', '0009_area_delivery_charge'),
+        ('products', '0025_product_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyProductSales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('modified_on', models.DateTimeField(blank=True, help_text='Object modified date and time')),
+                ('created_on', models.DateTimeField(blank=True, help_text='Object created date and time')),
+                ('date', models.DateField(db_index=True, verbose_name='date')),
+                ('orders_count', models.PositiveIntegerField(default=0, verbose_name='orders count')),
+                ('units', models.PositiveIntegerField(default=0, verbose_name='units')),
+                ('sales', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='sales')),
+                ('product', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='daily_sales', to='products.product')),
+            ],
+            options={
+                'verbose_name': 'Daily Product Sales',
+                'verbose_name_plural': 'Daily Product Sales',
+                'ordering': ('-date',),
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyPaymentMethodSales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('modified_on', models.DateTimeField(blank=True, help_text='Object modified date and time')),
+                ('created_on', models.DateTimeField(blank=True, help_text='Object created date and time')),
+                ('date', models.DateField(db_index=True, verbose_name='date')),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='amount')),
+                ('payments_count', models.PositiveIntegerField(default=0, verbose_name='payments count')),
+                ('method', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='core.paymentmethod')),
+            ],
+            options={
+                'verbose_name': 'Daily Payment Method Sales',
+                'verbose_name_plural': 'Daily Payment Method Sales',
+                'ordering': ('-date',),
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyCategorySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('modified_on', models.DateTimeField(blank=True, help_text='Object modified date and time')),
+                ('created_on', models.DateTimeField(blank=True, help_text='Object created date and time')),
+                ('date', models.DateField(db_index=True, verbose_name='date')),
+                ('orders_count', models.PositiveIntegerField(default=0, verbose_name='orders count')),
+                ('sales', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='sales')),
+                ('category', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='products.category')),
+            ],
+            options={
+                'verbose_name': 'Daily Category Sales',
+                'verbose_name_plural': 'Daily Category Sales',
+                'ordering': ('-date',),
+            },
+        ),
+    ]
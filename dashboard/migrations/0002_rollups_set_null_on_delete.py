@@ -0,0 +1,26 @@
+# Generated by Django 3.2 on 2026-10-18 17:48
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0025_product_search_vector'),
+        ('core', '0009_area_delivery_charge'),
+        ('dashboard', '0001_daily_rollups'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dailycategorysales',
+            name='category',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='daily_sales', to='products.category'),
+        ),
+        migrations.AlterField(
+            model_name='dailypaymentmethodsales',
+            name='method',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='daily_sales', to='core.paymentmethod'),
+        ),
+    ]
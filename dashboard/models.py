@@ -1,3 +1,75 @@
 from django.db import models
+from django.utils.translation import gettext_lazy as _
 
-# Create your models here.
+from common.models import TimeStampedModel
+
+
+class DailyPaymentMethodSales(TimeStampedModel):
+    """
+    Sales of a day (verified payments assigned to orders) per payment method.
+    """
+    date = models.DateField(_('date'), db_index=True)
+    method = models.ForeignKey(
+        'core.PaymentMethod',
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='daily_sales',
+    )
+    amount = models.DecimalField(_('amount'), max_digits=14, decimal_places=2, default=0)
+    payments_count = models.PositiveIntegerField(_('payments count'), default=0)
+
+    class Meta:
+        verbose_name = _('Daily Payment Method Sales')
+        verbose_name_plural = _('Daily Payment Method Sales')
+        ordering = ('-date',)
+
+    def __str__(self):
+        return f'{self.date}: {self.method}'
+
+
+class DailyCategorySales(TimeStampedModel):
+    """
+    Ordered products and their sales of a day per category.
+    """
+    date = models.DateField(_('date'), db_index=True)
+    category = models.ForeignKey(
+        'products.Category',
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='daily_sales',
+    )
+    orders_count = models.PositiveIntegerField(_('orders count'), default=0)
+    sales = models.DecimalField(_('sales'), max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        verbose_name = _('Daily Category Sales')
+        verbose_name_plural = _('Daily Category Sales')
+        ordering = ('-date',)
+
+    def __str__(self):
+        return f'{self.date}: {self.category}'
+
+
+class DailyProductSales(TimeStampedModel):
+    """
+    Times a product was ordered, units and sales of a day per product.
+    Row without product holds products deleted since.
+    """
+    date = models.DateField(_('date'), db_index=True)
+    product = models.ForeignKey(
+        'products.Product',
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='daily_sales',
+    )
+    orders_count = models.PositiveIntegerField(_('orders count'), default=0)
+    units = models.PositiveIntegerField(_('units'), default=0)
+    sales = models.DecimalField(_('sales'), max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        verbose_name = _('Daily Product Sales')
+        verbose_name_plural = _('Daily Product Sales')
+        ordering = ('-date',)
+
+    def __str__(self):
+        return f'{self.date}: {self.product}'
@@ -0,0 +1,130 @@
+import datetime
+
+from django.db import connection, transaction
+from django.db.models import F, Sum, Count
+from django.utils import timezone
+
+from common.redis_client import redis_connection as r
+from orders.models import OrderProduct
+from payments.models import Payment
+from .cache import invalidate_dashboard_cache
+from .helpers.dates import get_datetime_range
+from .models import DailyPaymentMethodSales, DailyCategorySales, DailyProductSales
+
+# namespace of postgres advisory locks taken while rebuilding a day
+ROLLUP_LOCK_NAMESPACE = 7341
+# days having payments or orders not counted in their rollups yet
+DIRTY_DAYS_KEY = 'dashboard:rollups:dirty_days'
+
+
+def rebuild_daily_rollups(date):
+    """
+    Recomputes rollups of a day from payments and ordered products,
+    replacing whatever was stored for that day.
+    """
+    start, end = get_datetime_range(date)
+    payment_method_sales = (
+        Payment.objects
+        .filter(
+            payment_status='verified',
+            order_assigned=True,
+            created_on__gte=start,
+            created_on__lt=end,
+        )
+        .order_by()
+        .values('method')
+        .annotate(amount=Sum('amount'), payments_count=Count('id'))
+    )
+    ordered_products = (
+        OrderProduct.objects
+        .filter(created_on__gte=start, created_on__lt=end)
+        .order_by()
+    )
+    category_sales = (
+        ordered_products
+        .values(category_id=F('product__sub_category__category'))
+        .annotate(orders_count=Count('id'), sales=Sum('net_total'))
+    )
+    product_sales = (
+        ordered_products
+        .values('product')
+        .annotate(orders_count=Count('id'), units=Sum('quantity'), sales=Sum('net_total'))
+    )
+
+    now = timezone.now()
+    timestamps = {'date': date, 'created_on': now, 'modified_on': now}
+    with transaction.atomic():
+        # rebuilds of the same day run one after another, so that the day
+        # isn't stored twice
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT pg_advisory_xact_lock(%s, %s)',
+                [ROLLUP_LOCK_NAMESPACE, date.toordinal()]
+            )
+        DailyPaymentMethodSales.objects.filter(date=date).delete()
+        DailyCategorySales.objects.filter(date=date).delete()
+        DailyProductSales.objects.filter(date=date).delete()
+        DailyPaymentMethodSales.objects.bulk_create([
+            DailyPaymentMethodSales(
+                method_id=row['method'],
+                amount=row['amount'],
+                payments_count=row['payments_count'],
+                **timestamps
+            )
+            for row in payment_method_sales
+        ])
+        DailyCategorySales.objects.bulk_create([
+            DailyCategorySales(
+                category_id=row['category_id'],
+                orders_count=row['orders_count'],
+                sales=row['sales'],
+                **timestamps
+            )
+            for row in category_sales
+        ])
+        DailyProductSales.objects.bulk_create([
+            DailyProductSales(
+                product_id=row['product'],
+                orders_count=row['orders_count'],
+                units=row['units'],
+                sales=row['sales'],
+                **timestamps
+            )
+            for row in product_sales
+        ])
+        invalidate_dashboard_cache()
+
+
+def rebuild_recent_daily_rollups(days=2):
+    """
+    Recomputes rollups of the last given number of days, today included.
+    """
+    today = timezone.localdate()
+    for days_ago in range(days):
+        rebuild_daily_rollups(today - datetime.timedelta(days=days_ago))
+
+
+def mark_days_dirty(*dates):
+    """
+    Marks days to be rebuilt by the next rebuild_dirty_daily_rollups.
+    """
+    r.sadd(DIRTY_DAYS_KEY, *[date.isoformat() for date in dates])
+
+
+def rebuild_dirty_daily_rollups():
+    """
+    Recomputes rollups of days marked dirty, each day once however many
+    orders were placed on it, and returns them.
+    """
+    dates = sorted(
+        datetime.date.fromisoformat(date.decode())
+        for date in r.spop(DIRTY_DAYS_KEY, r.scard(DIRTY_DAYS_KEY)) or []
+    )
+    for i, date in enumerate(dates):
+        try:
+            rebuild_daily_rollups(date)
+        except Exception:
+            # mark what couldn't be rebuilt again for the next run
+            mark_days_dirty(*dates[i:])
+            raise
+    return dates
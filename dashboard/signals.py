@@ -0,0 +1,29 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from orders.models import Order
+from payments.models import Payment
+from .cache import invalidate_dashboard_cache
+
+
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+def invalidate_dashboard_cache_on_order_change(sender, instance, raw=False, **kwargs):
+    """
+    Invalidates cached dashboards when an order is placed, completed,
+    cancelled or deleted.
+    """
+    if raw:
+        return
+    invalidate_dashboard_cache()
+
+
+@receiver(post_save, sender=Payment)
+@receiver(post_delete, sender=Payment)
+def invalidate_dashboard_cache_on_verified_payment(sender, instance, raw=False, **kwargs):
+    """
+    Invalidates cached dashboards when a verified payment is written.
+    """
+    if raw or instance.payment_status != 'verified':
+        return
+    invalidate_dashboard_cache()
@@ -0,0 +1,68 @@
+import datetime
+from celery import shared_task
+from django.core.cache import cache
+from django.utils import timezone
+
+from orders.models import Order, PreOrderProductBundle
+from .cache import get_dashboard_version, get_dashboard_lock_key, store_dashboard_response
+from .rollups import mark_days_dirty, rebuild_dirty_daily_rollups, rebuild_recent_daily_rollups
+
+
+@shared_task
+def rebuild_recent_dashboard_rollups(days=2):
+    """
+    Keeps rollups of the last days in sync with payments and orders.
+    """
+    rebuild_recent_daily_rollups(days)
+
+
+@shared_task
+def rebuild_dirty_dashboard_rollups():
+    """
+    Counts orders placed since the last run in their days' rollups.
+    """
+    rebuild_dirty_daily_rollups()
+
+
+@shared_task(
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_kwargs={'max_retries': 5},
+)
+def mark_dashboard_rollups_dirty_for_order(order_id):
+    """
+    Marks the days order and its payment were created on to be rebuilt.
+    """
+    order_obj = Order.objects.select_related('payment').get(pk=order_id)
+    mark_days_dirty(
+        timezone.localdate(order_obj.created_on),
+        timezone.localdate(order_obj.payment.created_on),
+    )
+
+
+@shared_task(
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_kwargs={'max_retries': 5},
+)
+def mark_dashboard_rollups_dirty_for_pre_order(pre_order_id):
+    """
+    Marks the day pre-order's payment was created on to be rebuilt, its
+    payment counts in payment method sales.
+    """
+    pre_order_obj = PreOrderProductBundle.objects.select_related('payment').get(pk=pre_order_id)
+    mark_days_dirty(timezone.localdate(pre_order_obj.payment.created_on))
+
+
+@shared_task
+def refresh_dashboard_response(name, date, version):
+    """
+    Recomputes a stale cached dashboard response, unless dashboards were
+    invalidated meanwhile.
+    """
+    date = datetime.date.fromisoformat(date)
+    try:
+        if version == get_dashboard_version():
+            store_dashboard_response(name, date, version)
+    finally:
+        cache.delete(get_dashboard_lock_key(name, date, version))
@@ -1,3 +1,77 @@
-from django.test import TestCase
+from datetime import timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.models import PaymentMethod
+from payments.models import Payment
+from users.models import User
+from .models import DailyPaymentMethodSales, DailyProductSales
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class DashboardQueryCountTestCase(TestCase):
+    """
+    Dashboard views issue a fixed number of queries whatever the data size.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin@example.com', 'password')
+        cls.method = method = PaymentMethod.objects.create(method_name='Esewa', slug='esewa')
+        today = timezone.localdate()
+        for days_ago in range(10):
+            date = today - timedelta(days=days_ago)
+            DailyPaymentMethodSales.objects.create(
+                date=date,
+                method=method,
+                amount=Decimal('100.00'),
+                payments_count=1,
+            )
+            DailyProductSales.objects.create(
+                date=date,
+                orders_count=2,
+                units=3,
+                sales=Decimal('100.00'),
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_accounting_query_count(self):
+        with self.assertNumQueries(8):
+            response = self.client.get('/api/dashboard/accounting/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total_sales'], Decimal('1000.00'))
+        self.assertEqual(response.data['sales_today'], Decimal('100.00'))
+        self.assertEqual(len(response.data['weekly_sales']), 7)
+        self.assertEqual(response.data['orders_today'], 2)
+        self.assertEqual(len(response.data['order_data_for_last_seven_days']), 7)
+
+    def test_overview_query_count(self):
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/dashboard/overview/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['weekly_sales']), 7)
+
+    def test_cached_response(self):
+        self.client.get('/api/dashboard/overview/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/dashboard/overview/')
+        self.assertEqual(len(response.data['weekly_sales']), 7)
+
+    def test_verified_payment_invalidates_cached_response(self):
+        self.client.get('/api/dashboard/overview/')
+        with self.captureOnCommitCallbacks(execute=True):
+            Payment.objects.create(
+                method=self.method,
+                payment_status='verified',
+                amount=Decimal('50.00'),
+            )
+        response = self.client.get('/api/dashboard/overview/')
+        self.assertEqual(response.data['todays_earnings'], Decimal('50.00'))
@@ -1,10 +1,12 @@
 from django.urls import path
 from .views import (
     OverviewAPIView,
-    AccountingAPIView
+    AccountingAPIView,
+    ExportAPIView,
 )
 
 urlpatterns = [
     path('overview/', OverviewAPIView.as_view(),name='overview'),
     path('accounting/', AccountingAPIView.as_view(),name='accounting'),
-]
\ No newline at end of file
+    path('export/<str:export_name>/', ExportAPIView.as_view(),name='export'),
+]
@@ -1,2 +1,3 @@
 from .overview import OverviewAPIView
-from .accounting import AccountingAPIView
\ No newline at end of file
+from .accounting import AccountingAPIView
+from .export import ExportAPIView
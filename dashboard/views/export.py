@@ -0,0 +1,28 @@
+from django.http import Http404, StreamingHttpResponse
+from rest_framework.views import APIView
+from rest_framework.permissions import (
+    IsAdminUser,
+)
+from ..exports import EXPORTS, get_export_date, get_export_rows, stream_csv
+
+
+class ExportAPIView(APIView):
+    """
+    APIView that streams orders, order lines or payments created from
+    start_date to end_date as csv.
+    """
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request, export_name, *args, **kwargs):
+        if export_name not in EXPORTS:
+            raise Http404
+        start_date = get_export_date(request.query_params.get('start_date'), 'start_date')
+        end_date = get_export_date(request.query_params.get('end_date'), 'end_date')
+        response = StreamingHttpResponse(
+            stream_csv(get_export_rows(export_name, start_date, end_date)),
+            content_type='text/csv',
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{export_name}-{start_date}-{end_date}.csv"'
+        )
+        return response
@@ -0,0 +1,55 @@
+import time
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from ..cache import (
+    get_dashboard_version,
+    get_dashboard_key,
+    get_dashboard_lock_key,
+    store_dashboard_response,
+    DASHBOARD_CACHE_LOCK_TIMEOUT,
+)
+from ..tasks import refresh_dashboard_response
+
+# seconds a request waits for another one computing the same response
+DASHBOARD_CACHE_WAIT = 5
+
+
+class CachedDashboardMixin(object):
+    """
+    Serves today's response of dashboard_name from cache. A stale response
+    is served while a worker recomputes it, and a missing one is computed
+    by a single request while concurrent ones wait for it.
+    """
+    dashboard_name = None
+
+    def get(self, request, *args, **kwargs):
+        return Response(self.get_dashboard_data(), status.HTTP_200_OK)
+
+    def get_dashboard_data(self):
+        name, today = self.dashboard_name, timezone.localdate()
+        version = get_dashboard_version()
+        key = get_dashboard_key(name, today, version)
+        lock_key = get_dashboard_lock_key(name, today, version)
+
+        cached = cache.get(key)
+        if cached is not None:
+            if cached['fresh_until'] < time.time() and cache.add(lock_key, 1, DASHBOARD_CACHE_LOCK_TIMEOUT):
+                refresh_dashboard_response.delay(name, today.isoformat(), version)
+            return cached['data']
+
+        if not cache.add(lock_key, 1, DASHBOARD_CACHE_LOCK_TIMEOUT):
+            deadline = time.monotonic() + DASHBOARD_CACHE_WAIT
+            while time.monotonic() < deadline:
+                time.sleep(0.1)
+                cached = cache.get(key)
+                if cached is not None:
+                    return cached['data']
+            # whoever holds the lock is too slow, compute without it
+            return store_dashboard_response(name, today, version)
+        try:
+            return store_dashboard_response(name, today, version)
+        finally:
+            cache.delete(lock_key)
@@ -1,14 +1,114 @@
-from celery import shared_task
-from common.tasks import send_email
+import smtplib
+
+from celery import group, shared_task
+from celery.utils.time import get_exponential_backoff_interval
+
+from common.mail import TransientMailError, get_transport
+from common.tasks import get_mail_credentials, build_message
+from .models import Newsletter, Subscriber
+
+NEWSLETTER_FROM_MAIL = 'akku@mail.akku.gg'
+NEWSLETTER_CHUNK_SIZE = 500
+# how often, in mails, chunk task reports its progress
+PROGRESS_EVERY = 50
+# longest wait, in seconds, before retrying a chunk
+RETRY_BACKOFF_MAX = 60 * 10
+
+
+def get_subscriber_pk_ranges(chunk_size=NEWSLETTER_CHUNK_SIZE):
+    """
+    Yields (first_pk, last_pk) ranges covering chunk_size active subscribers
+    each, streaming subscriber ids from the database.
+    """
+    subscriber_ids = (
+        Subscriber.objects
+        .filter(active=True)
+        .order_by('pk')
+        .values_list('pk', flat=True)
+        .iterator(chunk_size=2000)
+    )
+    first_pk = last_pk = None
+    count = 0
+    for pk in subscriber_ids:
+        if first_pk is None:
+            first_pk = pk
+        last_pk = pk
+        count += 1
+        if count == chunk_size:
+            yield first_pk, last_pk
+            first_pk = None
+            count = 0
+    if first_pk is not None:
+        yield first_pk, last_pk
+
+
+def get_newsletter_html(content, subscriber):
+    return content + f'<br><a style="display:block;background:black;color:white;text-align:center" href=http://localhost:8000/api/newsletter/unsubscribe/?email={subscriber.email}&code={subscriber.code}>unsubscribe</a>'
 
 
 @shared_task
-def send_subscription_email(subscribers, newsletter):
-    content = newsletter['content']
-    subject = newsletter['email_subject']
+def send_subscription_email(newsletter_id, chunk_size=NEWSLETTER_CHUNK_SIZE):
+    """
+    Splits active subscribers into chunks and sends newsletter to every
+    chunk in a separate task, returns number of chunks.
+    """
+    chunks = [
+        send_subscription_email_chunk.si(newsletter_id, first_pk, last_pk)
+        for first_pk, last_pk in get_subscriber_pk_ranges(chunk_size)
+    ]
+    if chunks:
+        group(chunks).apply_async()
+    return len(chunks)
+
+
+@shared_task(bind=True, max_retries=5)
+def send_subscription_email_chunk(self, newsletter_id, first_pk, last_pk, progress=None):
+    """
+    Sends newsletter to active subscribers with pk in [first_pk, last_pk]
+    over a single SMTP session, reporting progress as it goes.
+
+    On transient errors the chunk is retried with backoff from the
+    subscriber mail couldn't be sent to, so nobody gets it twice.
+    """
+    newsletter = Newsletter.objects.get(pk=newsletter_id)
+    subscribers = (
+        Subscriber.objects
+        .filter(active=True, pk__gte=first_pk, pk__lte=last_pk)
+        .order_by('pk')
+        .only('email', 'code')
+        .iterator()
+    )
+    username, password = get_mail_credentials(NEWSLETTER_FROM_MAIL)
+    # SMTP transport keeps one logged in session open for the whole chunk
+    transport = get_transport()
+    # carried over retries, failed counts permanently refused mails only
+    progress = progress or {'sent': 0, 'failed': 0}
     for subscriber in subscribers:
-        email = subscriber['email']
-        code = subscriber['code']
-        html_content = content + f'<br><a style="display:block;background:black;color:white;text-align:center" href=http://localhost:8000/api/newsletter/unsubscribe/?email={email}&code={code}>unsubscribe</a>'
-        send_email.delay(subject=subject, message=None, from_mail='akku@mail.akku.gg', to_mail=[email, ],
-                         html_content=html_content)
+        msg = build_message(
+            newsletter.email_subject,
+            None,
+            get_newsletter_html(newsletter.content, subscriber),
+            [subscriber.email, ],
+            username,
+        ).as_string()
+        try:
+            transport.send(username, password, [subscriber.email, ], msg)
+        except TransientMailError as e:
+            raise self.retry(
+                args=(newsletter_id, subscriber.pk, last_pk),
+                kwargs={'progress': progress},
+                exc=e,
+                countdown=get_exponential_backoff_interval(
+                    factor=1,
+                    retries=self.request.retries,
+                    maximum=RETRY_BACKOFF_MAX,
+                    full_jitter=True,
+                ),
+            )
+        except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError):
+            progress['failed'] += 1
+        else:
+            progress['sent'] += 1
+        if (progress['sent'] + progress['failed']) % PROGRESS_EVERY == 0:
+            self.update_state(state='PROGRESS', meta=progress)
+    return progress
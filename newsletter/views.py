@@ -177,10 +177,7 @@ class SendSubsriptionMailAPI(APIView):
                 },
                 status.HTTP_400_BAD_REQUEST
             )
-        subscribers = SubscriberSerializer(subscribers, many=True).data
-        newsletter = NewsletterSerializer(newsletter).data
-
-        send_subscription_email.delay(subscribers, newsletter)
+        send_subscription_email.delay(newsletter.pk)
         return Response(
             {
                 'message': 'Mail is being sent'
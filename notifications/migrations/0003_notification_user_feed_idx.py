@@ -0,0 +1,17 @@
+# Generated by Django 3.2 on 2026-10-18 17:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_notification_unread_user_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', '-created_on', '-id'], name='notification_user_feed_idx'),
+        ),
+    ]
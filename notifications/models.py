@@ -9,5 +9,18 @@ class Notification(TimeStampedModel):
     user = models.ForeignKey('users.User', on_delete=models.CASCADE)
     is_read = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['user', '-created_on', '-id'],
+                name='notification_user_feed_idx',
+            ),
+            models.Index(
+                fields=['user'],
+                condition=models.Q(is_read=False),
+                name='notification_unread_user_idx',
+            ),
+        ]
+
     def __str__(self):
         return f'{self.title}'
@@ -0,0 +1,11 @@
+from rest_framework.pagination import CursorPagination
+
+
+class NotificationCursorPagination(CursorPagination):
+    """
+    Keyset pagination for notification feeds, newest first, so that
+    reading a page costs the same at any depth.
+    """
+    ordering = ('-created_on', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
@@ -0,0 +1,337 @@
+import asyncio
+import functools
+import json
+import logging
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+from asgiref.sync import sync_to_async
+from corsheaders.conf import conf as cors_conf
+from corsheaders.middleware import CorsMiddleware
+from django.db import close_old_connections
+from django.db.models import Max
+from redis.exceptions import RedisError
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, AuthenticationFailed
+
+from common.redis_client import redis_connection as r
+from .models import Notification
+from .serializers import NotificationSerializer
+from .utils import get_notification_channel
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_STREAM_PATH = '/api/notifications/stream/'
+HEARTBEAT_INTERVAL = 15
+RECONNECT_INTERVAL = 1
+REPLAY_PAGE_SIZE = 100
+# notifications queued per stream before it is resynced from the database
+QUEUE_SIZE = 100
+# queued in place of a notification when a stream has to catch up from
+# the database
+RESYNC = object()
+
+
+def get_header(scope, name):
+    for key, value in scope['headers']:
+        if key.decode('latin1').lower() == name:
+            return value.decode('latin1')
+    return None
+
+
+# only used for its origin checks, the stream doesn't go through django
+cors_middleware = CorsMiddleware(lambda request: None)
+
+
+def get_cors_headers(scope, preflight=False):
+    """
+    Returns CORS headers django-cors-headers would add to a response of a
+    request from scope's origin.
+    """
+    origin = get_header(scope, 'origin')
+    if not origin:
+        return []
+    if (
+        not cors_conf.CORS_ALLOW_ALL_ORIGINS
+        and not cors_middleware.origin_found_in_white_lists(origin, urlparse(origin))
+    ):
+        return []
+    headers = []
+    if cors_conf.CORS_ALLOW_CREDENTIALS:
+        headers.append((b'access-control-allow-credentials', b'true'))
+    if cors_conf.CORS_ALLOW_ALL_ORIGINS and not cors_conf.CORS_ALLOW_CREDENTIALS:
+        headers.append((b'access-control-allow-origin', b'*'))
+    else:
+        headers.append((b'access-control-allow-origin', origin.encode('latin1')))
+    if cors_conf.CORS_EXPOSE_HEADERS:
+        headers.append((b'access-control-expose-headers', ', '.join(cors_conf.CORS_EXPOSE_HEADERS).encode()))
+    if preflight:
+        headers.append((b'access-control-allow-headers', ', '.join(cors_conf.CORS_ALLOW_HEADERS).encode()))
+        headers.append((b'access-control-allow-methods', ', '.join(cors_conf.CORS_ALLOW_METHODS).encode()))
+        if cors_conf.CORS_PREFLIGHT_MAX_AGE:
+            headers.append((b'access-control-max-age', str(cors_conf.CORS_PREFLIGHT_MAX_AGE).encode()))
+    return headers
+
+
+def database_sync_to_async(function):
+    """
+    sync_to_async that closes unusable and expired database connections
+    before and after the call, as django does around every request.
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        close_old_connections()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            close_old_connections()
+    return sync_to_async(wrapper)
+
+
+@database_sync_to_async
+def get_user(scope):
+    """
+    Returns user authenticated by JWT access token given in `token` query
+    parameter or Authorization header, EventSource can't set headers.
+    """
+    query = parse_qs(scope['query_string'].decode())
+    raw_token = query.get('token', [None])[0]
+    if raw_token is None:
+        header = get_header(scope, 'authorization') or ''
+        parts = header.split()
+        if len(parts) == 2 and parts[0] == 'Bearer':
+            raw_token = parts[1]
+    if raw_token is None:
+        return None
+    authentication = JWTAuthentication()
+    try:
+        return authentication.get_user(authentication.get_validated_token(raw_token))
+    except (InvalidToken, AuthenticationFailed):
+        return None
+
+
+def get_last_event_id(scope):
+    """
+    Returns id of the last notification client received, sent by
+    EventSource on reconnect or given in `last_event_id` query parameter.
+    """
+    query = parse_qs(scope['query_string'].decode())
+    last_event_id = get_header(scope, 'last-event-id') or query.get('last_event_id', [None])[0]
+    if last_event_id is not None and last_event_id.isdigit():
+        return int(last_event_id)
+    return None
+
+
+@database_sync_to_async
+def get_missed_notifications(user, last_event_id):
+    notifications = (
+        Notification.objects
+        .filter(user=user, pk__gt=last_event_id)
+        .order_by('id')[:REPLAY_PAGE_SIZE]
+    )
+    return NotificationSerializer(notifications, many=True).data
+
+
+@database_sync_to_async
+def get_latest_notification_id(user):
+    return (
+        Notification.objects
+        .filter(user=user)
+        .aggregate(latest_id=Max('id'))
+        .get('latest_id') or 0
+    )
+
+
+class NotificationBroker(object):
+    """
+    Listens to notifications of all users on one redis connection per
+    process, in its own thread, and hands each of them to the queues of
+    its user's open streams.
+    """
+
+    def __init__(self):
+        self.queues = {}
+        self.lock = threading.Lock()
+        self.loop = None
+
+    def subscribe(self, user_id):
+        """
+        Returns queue receiving user's notifications from now on, RESYNC
+        is queued too once listening starts or restarts.
+        """
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        with self.lock:
+            self.queues.setdefault(user_id, set()).add(queue)
+            if self.loop is None:
+                self.loop = asyncio.get_running_loop()
+                threading.Thread(target=self.listen, name='notification-broker', daemon=True).start()
+        return queue
+
+    def unsubscribe(self, user_id, queue):
+        with self.lock:
+            queues = self.queues.get(user_id, set())
+            queues.discard(queue)
+            if not queues:
+                self.queues.pop(user_id, None)
+
+    def listen(self):
+        # runs as long as the process, whatever goes wrong listening starts
+        # over so that streams never silently stop receiving
+        while True:
+            pubsub = r.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.psubscribe(get_notification_channel('*'))
+                # notifications published while disconnected are lost, so
+                # every stream catches up from the database
+                self.broadcast(RESYNC)
+                for message in pubsub.listen():
+                    try:
+                        self.handle(message)
+                    except Exception:
+                        logger.exception('Could not deliver notification message %r.', message)
+            except RedisError:
+                logger.warning('Lost notifications subscription, reconnecting.', exc_info=True)
+                time.sleep(RECONNECT_INTERVAL)
+            except Exception:
+                logger.exception('Notifications listener failed, restarting.')
+                time.sleep(RECONNECT_INTERVAL)
+            finally:
+                try:
+                    pubsub.close()
+                except Exception:
+                    pass
+
+    def handle(self, message):
+        if message['type'] == 'pmessage':
+            user_id = int(message['channel'].rsplit(b':', 1)[1])
+            self.deliver(user_id, message['data'])
+
+    def broadcast(self, data):
+        with self.lock:
+            user_ids = list(self.queues)
+        for user_id in user_ids:
+            self.deliver(user_id, data)
+
+    def deliver(self, user_id, data):
+        with self.lock:
+            queues = list(self.queues.get(user_id, ()))
+        for queue in queues:
+            self.loop.call_soon_threadsafe(put_or_resync, queue, data)
+
+
+def put_or_resync(queue, data):
+    """
+    Puts data in queue, or replaces everything queued with RESYNC when
+    the stream is too slow to keep up.
+    """
+    try:
+        queue.put_nowait(data)
+    except asyncio.QueueFull:
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(RESYNC)
+
+
+broker = NotificationBroker()
+
+
+async def send_body(send, body):
+    await send({'type': 'http.response.body', 'body': body.encode(), 'more_body': True})
+
+
+async def send_notification(send, data):
+    await send_body(send, f"id: {data['id']}\nevent: notification\ndata: {json.dumps(data)}\n\n")
+
+
+async def send_missed_notifications(send, user, last_event_id):
+    """
+    Sends notifications after last_event_id page by page and returns id of
+    the last one sent.
+    """
+    while True:
+        notifications = await get_missed_notifications(user, last_event_id)
+        for data in notifications:
+            await send_notification(send, data)
+            last_event_id = data['id']
+        if len(notifications) < REPLAY_PAGE_SIZE:
+            return last_event_id
+
+
+async def notification_stream(scope, receive, send):
+    """
+    ASGI app that streams user's new notifications as server-sent events.
+    """
+    if scope['method'] == 'OPTIONS':
+        # preflight of clients sending the token in Authorization header
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': get_cors_headers(scope, preflight=True),
+        })
+        await send({'type': 'http.response.body', 'body': b''})
+        return
+
+    cors_headers = get_cors_headers(scope)
+    user = await get_user(scope)
+    if user is None:
+        await send({
+            'type': 'http.response.start',
+            'status': 401,
+            'headers': [(b'content-type', b'application/json')] + cors_headers,
+        })
+        await send({
+            'type': 'http.response.body',
+            'body': json.dumps({'error_message': 'Valid access token is needed.'}).encode(),
+        })
+        return
+
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', b'text/event-stream'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+        ] + cors_headers,
+    })
+
+    async def wait_for_disconnect():
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+    disconnected = asyncio.ensure_future(wait_for_disconnect())
+    # subscribe before replaying so that nothing is missed in between
+    queue = broker.subscribe(user.pk)
+    try:
+        last_event_id = get_last_event_id(scope)
+        if last_event_id is None:
+            last_event_id = await get_latest_notification_id(user)
+        else:
+            last_event_id = await send_missed_notifications(send, user, last_event_id)
+
+        while True:
+            message = asyncio.ensure_future(queue.get())
+            await asyncio.wait(
+                {message, disconnected},
+                timeout=HEARTBEAT_INTERVAL,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if disconnected.done():
+                message.cancel()
+                break
+            if not message.done():
+                message.cancel()
+                await send_body(send, ': heartbeat\n\n')
+                continue
+            data = message.result()
+            if data is RESYNC:
+                last_event_id = await send_missed_notifications(send, user, last_event_id)
+                continue
+            data = json.loads(data)
+            if data['id'] > last_event_id:
+                await send_notification(send, data)
+                last_event_id = data['id']
+    finally:
+        disconnected.cancel()
+        broker.unsubscribe(user.pk, queue)
@@ -1,9 +1,10 @@
 from django.urls import path, include
 
 from .routers import router
-from .views import MarkAllAsReadAPI
+from .views import MarkAllAsReadAPI, UnreadCountAPI
 
 urlpatterns = [
     path('', include(router.urls)),
     path('mark-all-as-read/', MarkAllAsReadAPI.as_view(), name='mark_all_as_read'),
+    path('unread-count/', UnreadCountAPI.as_view(), name='unread_count'),
 ]
@@ -1,10 +1,96 @@
+import json
+
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from redis.exceptions import RedisError
 
+from common.redis_client import redis_connection as r
 from .models import Notification
+from .serializers import NotificationSerializer
+
+# seconds a counted number of unread notifications is served from cache,
+# short so that a count racing with a write can't be served for long
+UNREAD_COUNT_TIMEOUT = 10
+
+
+def get_unread_count_key(user_id):
+    return f'notifications:unread_count:{user_id}'
+
+
+def get_unread_count(user):
+    """
+    Returns number of unread notifications of user, counted from the
+    database only when cached counter is missing.
+    """
+    key = get_unread_count_key(user.pk)
+    unread_count = cache.get(key)
+    if unread_count is None:
+        unread_count = Notification.objects.filter(user=user, is_read=False).count()
+        # add, so that the count is dropped if a write invalidated it meanwhile
+        cache.add(key, unread_count, UNREAD_COUNT_TIMEOUT)
+    return unread_count
+
+
+def invalidate_unread_count(*user_ids):
+    """
+    Discards cached unread counts of users once the current transaction
+    commits, they are counted again on next read.
+    """
+    transaction.on_commit(
+        lambda: cache.delete_many([get_unread_count_key(user_id) for user_id in user_ids])
+    )
+
+
+def get_notification_channel(user_id):
+    return f'notifications:user:{user_id}'
+
+
+def publish_notifications(notifications):
+    """
+    Publishes notifications to their users' live streams once the current
+    transaction commits.
+    """
+    messages = [
+        (get_notification_channel(data['user']), json.dumps(data))
+        for data in NotificationSerializer(notifications, many=True).data
+    ]
+
+    def publish():
+        pipe = r.pipeline(transaction=False)
+        for channel, message in messages:
+            pipe.publish(channel, message)
+        try:
+            pipe.execute()
+        except RedisError:
+            # streams resume from the database on reconnect
+            pass
+    transaction.on_commit(publish)
+
 
-users = get_user_model().objects.filter(is_staff=True)
+def create_notification(title, body, user):
+    """
+    Creates notification for user, discarding their cached unread count.
+    """
+    notification = Notification.objects.create(title=title, body=body, user=user)
+    invalidate_unread_count(user.pk)
+    publish_notifications([notification])
+    return notification
 
 
 def bulk_create_notification_admin(data):
-    for user in users:
-        Notification.objects.create(**data, user=user)
+    """
+    Creates notification for every admin with a single insert.
+    """
+    admin_ids = list(get_user_model().objects.filter(is_staff=True).values_list('id', flat=True))
+    now = timezone.now()
+    # bulk_create skips TimeStampedModel.save, so timestamps are set here
+    notifications = Notification.objects.bulk_create([
+        Notification(**data, user_id=admin_id, created_on=now, modified_on=now)
+        for admin_id in admin_ids
+    ])
+    invalidate_unread_count(*admin_ids)
+    publish_notifications(notifications)
+    return notifications
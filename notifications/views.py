@@ -1,3 +1,4 @@
+from django.utils import timezone
 from rest_framework import permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -5,7 +6,9 @@ from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
 
 from .models import Notification
+from .pagination import NotificationCursorPagination
 from .serializers import NotificationSerializer
+from .utils import get_unread_count, invalidate_unread_count
 
 
 class NotificationAPI(ModelViewSet):
@@ -13,15 +16,23 @@ class NotificationAPI(ModelViewSet):
     serializer_class = NotificationSerializer
     http_method_names = ['get', ]
     permission_classes = [permissions.IsAuthenticated, ]
+    pagination_class = NotificationCursorPagination
 
     def get_queryset(self):
-        return Notification.objects.filter(user=self.request.user)
+        queryset = Notification.objects.filter(user=self.request.user)
+        # incremental sync, only notifications newer than the given one
+        after = self.request.query_params.get('after', None)
+        if after is not None and after.isdigit():
+            queryset = queryset.filter(pk__gt=after)
+        return queryset
 
     @action(methods=['get'], detail=True, url_path='mark-as-read')
     def mark_as_read(self, request, *args, **kwargs):
         obj = self.get_object()
-        obj.is_read = True
-        obj.save()
+        if not obj.is_read:
+            obj.is_read = True
+            obj.save()
+            invalidate_unread_count(obj.user_id)
         return Response(
             {
                 'message': 'Marked as read'
@@ -32,8 +43,10 @@ class NotificationAPI(ModelViewSet):
     @action(methods=['get'], detail=True, url_path='mark-as-unread')
     def mark_as_unread(self, request, *args, **kwargs):
         obj = self.get_object()
-        obj.is_read = True
-        obj.save()
+        if obj.is_read:
+            obj.is_read = False
+            obj.save()
+            invalidate_unread_count(obj.user_id)
         return Response(
             {
                 'message': 'Marked as unread'
@@ -46,13 +59,26 @@ class MarkAllAsReadAPI(APIView):
     permission_classes = [permissions.IsAuthenticated, ]
 
     def get(self, request, *args, **kwargs):
-        notifications = Notification.objects.filter(user=request.user, is_read=False)
-        for noti in notifications:
-            noti.is_read = True
-            noti.save()
+        Notification.objects.filter(user=request.user, is_read=False).update(
+            is_read=True,
+            modified_on=timezone.now()
+        )
+        invalidate_unread_count(request.user.pk)
         return Response(
             {
                 'message': 'Marked all as read'
             },
             status.HTTP_200_OK
         )
+
+
+class UnreadCountAPI(APIView):
+    permission_classes = [permissions.IsAuthenticated, ]
+
+    def get(self, request, *args, **kwargs):
+        return Response(
+            {
+                'unread_count': get_unread_count(request.user)
+            },
+            status.HTTP_200_OK
+        )
@@ -6,6 +6,7 @@ from .models import (
     Order,
     OrderProduct,
     PreOrderProductBundle,
+    StockReservation,
 )
 from products.models import RatingAndReview
 
@@ -125,3 +126,11 @@ class PreOrderProductBundleAdmin(admin.ModelAdmin):
             ),
         }),
     )
+
+
+@admin.register(StockReservation)
+class StockReservationAdmin(admin.ModelAdmin):
+    list_display = ('id', 'order', 'product', 'quantity', 'status', 'created_on',)
+    list_filter = ('status',)
+    search_fields = ('order__order_uuid', 'product__name',)
+    raw_id_fields = ('order', 'product',)
@@ -0,0 +1,119 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.template import Context, Engine
+
+from .models import OrderProduct, PreOrderProductBundle
+
+ORDER_MAIL_FIELDS = (
+    'order__order_uuid',
+    'order__user__email',
+    'order__user__full_name',
+    'order__estimated_delivery_date',
+    'order__sub_total',
+    'order__vat',
+    'order__discount',
+    'order__delivery_charge',
+    'order__final_price',
+    'order__reward_points',
+    'order__payment__method__method_name',
+    'order__shipping__first_name',
+    'order__shipping__last_name',
+    'order__shipping__street_address',
+    'order__shipping__phone_no',
+    'order__shipping__area__name',
+    'order__shipping__area__city__name',
+)
+ORDER_LINE_FIELDS = ('product__name', 'color', 'quantity', 'rate', 'net_total')
+PRE_ORDER_MAIL_FIELDS = (
+    'pre_order_uuid',
+    'user__email',
+    'user__full_name',
+    'product_bundle__name',
+    'quantity',
+    'rate',
+    'vat',
+    'discount',
+    'delivery_charge',
+    'final_price',
+    'reward_points',
+    'estimated_delivery_date',
+    'payment__method__method_name',
+    'shipping__first_name',
+    'shipping__last_name',
+    'shipping__street_address',
+    'shipping__phone_no',
+    'shipping__area__name',
+    'shipping__area__city__name',
+)
+
+
+@lru_cache(maxsize=None)
+def get_email_engine():
+    """
+    Returns template engine for mails that keeps compiled templates cached
+    for the lifetime of the process, whatever DEBUG is.
+    """
+    return Engine(
+        dirs=[str(settings.BASE_DIR / 'templates')],
+        loaders=[
+            ('django.template.loaders.cached.Loader', [
+                'django.template.loaders.filesystem.Loader',
+            ]),
+        ],
+    )
+
+
+def render_email(template_name, context):
+    return get_email_engine().get_template(template_name).render(Context(context))
+
+
+def flatten(row, prefix=''):
+    """
+    Returns values() row with prefix stripped and lookups joined by '_',
+    e.g. order__user__email -> user_email.
+    """
+    return {
+        key[len(prefix):].replace('__', '_'): value
+        for key, value in row.items()
+        if key.startswith(prefix)
+    }
+
+
+def add_shipping_address(context):
+    context['shipping_address'] = ', '.join(
+        part for part in (
+            context['shipping_street_address'],
+            context['shipping_area_name'],
+            context['shipping_area_city_name'],
+        ) if part
+    )
+    return context
+
+
+def get_order_mail_context(order_id):
+    """
+    Returns flat context of order mail with its lines, read in one query.
+    """
+    rows = list(
+        OrderProduct.objects
+        .filter(order_id=order_id)
+        .order_by('id')
+        .values(*ORDER_MAIL_FIELDS, *ORDER_LINE_FIELDS)
+    )
+    if not rows:
+        raise OrderProduct.DoesNotExist(f'Order with id:{order_id} has no products.')
+    context = flatten(rows[0], prefix='order__')
+    context['lines'] = [
+        flatten({field: row[field] for field in ORDER_LINE_FIELDS})
+        for row in rows
+    ]
+    return add_shipping_address(context)
+
+
+def get_pre_order_mail_context(pre_order_id):
+    """
+    Returns flat context of pre-order mail, read in one query.
+    """
+    row = PreOrderProductBundle.objects.filter(pk=pre_order_id).values(*PRE_ORDER_MAIL_FIELDS).get()
+    return add_shipping_address(flatten(row))
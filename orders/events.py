@@ -0,0 +1,49 @@
+from celery import group
+from django.db import transaction
+
+from dashboard.tasks import (
+    mark_dashboard_rollups_dirty_for_order,
+    mark_dashboard_rollups_dirty_for_pre_order,
+)
+from .tasks import (
+    send_order_created_mail,
+    notify_user_about_order,
+    notify_admins_about_order,
+    record_order_products_bought_together,
+    send_pre_order_created_mail,
+    notify_user_about_pre_order,
+    notify_admins_about_pre_order,
+)
+
+# tasks consuming an event, each called with id of the created object.
+# add consumers here rather than in checkout views.
+ORDER_CREATED_TASKS = [
+    send_order_created_mail,
+    notify_user_about_order,
+    notify_admins_about_order,
+    record_order_products_bought_together,
+    mark_dashboard_rollups_dirty_for_order,
+]
+PRE_ORDER_CREATED_TASKS = [
+    send_pre_order_created_mail,
+    notify_user_about_pre_order,
+    notify_admins_about_pre_order,
+    mark_dashboard_rollups_dirty_for_pre_order,
+]
+
+
+def publish(tasks, object_id):
+    """
+    Runs tasks in parallel once the current transaction commits.
+    """
+    transaction.on_commit(
+        lambda: group(task.si(object_id) for task in tasks).apply_async()
+    )
+
+
+def publish_order_created(order_obj):
+    publish(ORDER_CREATED_TASKS, order_obj.pk)
+
+
+def publish_pre_order_created(pre_order_obj):
+    publish(PRE_ORDER_CREATED_TASKS, pre_order_obj.pk)
@@ -0,0 +1,33 @@
+# Generated by Django 3.2 on 2026-10-18 17:23
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0025_product_search_vector'),
+        ('orders', '0014_preorderproductbundle_reward_points'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockReservation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('modified_on', models.DateTimeField(blank=True, help_text='Object modified date and time')),
+                ('created_on', models.DateTimeField(blank=True, help_text='Object created date and time')),
+                ('quantity', models.PositiveIntegerField(validators=[django.core.validators.MinValueValidator(1)], verbose_name='quantity')),
+                ('status', models.CharField(choices=[('Reserved', 'Reserved'), ('Completed', 'Completed'), ('Released', 'Released')], default='Reserved', help_text='Reserved stock is taken off product quantity, completed one is sold and released one is put back.', max_length=9, verbose_name='status')),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_reservations', to='orders.order')),
+                ('product', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='stock_reservations', to='products.product')),
+            ],
+            options={
+                'verbose_name': 'Stock Reservation',
+                'verbose_name_plural': 'Stock Reservations',
+                'ordering': ('-created_on',),
+            },
+        ),
+    ]
@@ -93,6 +93,9 @@ class OrderProduct(BaseModel):
     class Meta:
         verbose_name='Order Product'
         verbose_name_plural='Order Products'
+        indexes = [
+            models.Index(fields=['created_on'], name='orderproduct_created_on_idx'),
+        ]
 
 
 class Order(BaseModel):
@@ -187,6 +190,14 @@ class Order(BaseModel):
         verbose_name = _('Order')
         verbose_name_plural = _('Orders')
         ordering = ('-created_on',)
+        indexes = [
+            models.Index(fields=['created_on'], name='order_created_on_idx'),
+            models.Index(
+                fields=['delivery_status'],
+                condition=models.Q(delivery_status='Pending'),
+                name='order_pending_idx',
+            ),
+        ]
     
     def __str__(self):
         return f'{self.order_uuid}'
@@ -293,3 +304,43 @@ class PreOrderProductBundle(BaseModel):
     
     def __str__(self):
         return f'{self.pre_order_uuid}'
+
+
+class StockReservation(TimeStampedModel):
+    """
+    Model to store product stock reserved for an order.
+    """
+    STATUS = [
+        ('Reserved', 'Reserved'),
+        ('Completed', 'Completed'),
+        ('Released', 'Released'),
+    ]
+    order = models.ForeignKey(
+        Order,
+        on_delete=models.CASCADE,
+        related_name='stock_reservations',
+    )
+    product = models.ForeignKey(
+        'products.Product',
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='stock_reservations',
+    )
+    quantity = models.PositiveIntegerField(_('quantity'), validators=[MinValueValidator(1)])
+    status = models.CharField(
+        _('status'),
+        max_length=9,
+        choices=STATUS,
+        default='Reserved',
+        help_text=_(
+            'Reserved stock is taken off product quantity, completed one is sold and released one is put back.'
+        )
+    )
+
+    class Meta:
+        verbose_name = _('Stock Reservation')
+        verbose_name_plural = _('Stock Reservations')
+        ordering = ('-created_on',)
+
+    def __str__(self):
+        return f'{self.order}: {self.product} x {self.quantity}'
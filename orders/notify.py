@@ -1,8 +1,6 @@
-from django.template.loader import render_to_string
-
 from common.tasks import send_email
-from notifications.models import Notification
-from users.models import User
+from notifications.utils import create_notification, bulk_create_notification_admin
+from .emails import render_email, get_order_mail_context, get_pre_order_mail_context
 
 
 def notify_user_about_order_creation(order_obj):
@@ -12,11 +10,7 @@ def notify_user_about_order_creation(order_obj):
     title = f'{order_obj.order_uuid}: Order created'
     body = f'Your order has been created and estimated delivery date is {order_obj.estimated_delivery_date}'
     user = order_obj.user
-    Notification.objects.create(
-        title=title,
-        body=body,
-        user=user
-    )
+    create_notification(title, body, user)
 
 
 def notify_admin_about_order_creation(order_obj):
@@ -25,12 +19,7 @@ def notify_admin_about_order_creation(order_obj):
     """
     title = f'{order_obj.order_uuid}: Order created'
     body = f'Order has been created by {order_obj.user.email} and estimated delivery date is {order_obj.estimated_delivery_date}'
-    for admin in User.objects.filter(is_staff=True):
-        Notification.objects.create(
-            title=title,
-            body=body,
-            user=admin
-        )
+    bulk_create_notification_admin({'title': title, 'body': body})
 
 
 def notify_user_about_pre_order_creation(pre_order_obj):
@@ -40,11 +29,7 @@ def notify_user_about_pre_order_creation(pre_order_obj):
     title = f'{pre_order_obj.pre_order_uuid}: Pre-Order created'
     body = f'Your pre-order has been created.'
     user = pre_order_obj.user
-    Notification.objects.create(
-        title=title,
-        body=body,
-        user=user
-    )
+    create_notification(title, body, user)
 
 def notify_admin_about_pre_order_creation(pre_order_obj):
     """
@@ -52,26 +37,18 @@ def notify_admin_about_pre_order_creation(pre_order_obj):
     """
     title = f'{pre_order_obj.pre_order_uuid}: Pre-order created'
     body = f'Pre-order has been created.'
-    user = pre_order_obj.user
-    for admin in User.objects.filter(is_staff=True):
-        Notification.objects.create(
-            title=title,
-            body=body,
-            user=user
-        )
+    bulk_create_notification_admin({'title': title, 'body': body})
 
 
-def send_order_create_mail_to_user(order_obj):
+def send_order_create_mail_to_user(order_id):
     """
     Send mail to user after checkout.
     """
+    context = get_order_mail_context(order_id)
     subject = f'Your order has been created successfully.'
-    message = f'order ID: {order_obj.order_uuid}'
-    context = {
-        'order_obj':order_obj
-    }
-    html_content = render_to_string('order_created.html', context)
-    to_mail = [order_obj.user.email, ]
+    message = f'order ID: {context["order_uuid"]}'
+    html_content = render_email('order_created.html', context)
+    to_mail = [context['user_email'], ]
     send_email(
         subject,
         message,
@@ -81,21 +58,19 @@ def send_order_create_mail_to_user(order_obj):
     )
 
 
-def send_pre_order_create_mail_to_user(pre_order_obj):
+def send_pre_order_create_mail_to_user(pre_order_id):
     """
     Send mail to user after checkout.
     """
+    context = get_pre_order_mail_context(pre_order_id)
     subject = f'Your order has been created successfully.'
-    message = f'order ID: {pre_order_obj.pre_order_uuid}'
-    context = {
-        'pre_order_obj':pre_order_obj
-    }
-    html_content = render_to_string('pre_order_created.html', context)
-    to_mail = [pre_order_obj.user.email, ]
+    message = f'order ID: {context["pre_order_uuid"]}'
+    html_content = render_email('pre_order_created.html', context)
+    to_mail = [context['user_email'], ]
     send_email(
         subject,
         message,
         html_content,
         to_mail,
         from_mail=""
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,123 @@
+from django.db.models import F, Q, Case, When, Value, PositiveIntegerField
+from django.utils import timezone
+from rest_framework import serializers
+
+from products.models import Product
+from .models import StockReservation
+from .utils import check_product_quantity
+
+
+def get_quantity_case(quantities):
+    """
+    Returns CASE expression that maps product id to its quantity.
+    """
+    return Case(
+        *[When(pk=product_id, then=Value(quantity)) for product_id, quantity in quantities.items()],
+        default=Value(0),
+        output_field=PositiveIntegerField(),
+    )
+
+
+def reserve_stock(order_obj, cart_pricer):
+    """
+    Takes ordered quantity off product stock with a single conditional
+    UPDATE and records reservations for the order.
+
+    Raises validation error if any product doesn't have enough stock,
+    should be called inside transaction so that nothing is reserved then.
+    """
+    quantities = {}
+    for cart_item, product_obj in cart_pricer.items:
+        quantities[product_obj.pk] = quantities.get(product_obj.pk, 0) + cart_item.get('quantity', None)
+
+    in_stock = Q()
+    for product_id, quantity in quantities.items():
+        in_stock |= Q(pk=product_id, quantity__gte=quantity)
+    reserved = Product.objects.filter(in_stock).update(
+        quantity=F('quantity') - get_quantity_case(quantities)
+    )
+    if reserved != len(quantities):
+        # stock was taken by another order since validation. raising rolls
+        # back the products that were updated, stock read now only names
+        # the product in error as it may have been restocked meanwhile.
+        for product_obj in Product.objects.filter(pk__in=quantities):
+            check_product_quantity(product_obj, quantities[product_obj.pk])
+        raise serializers.ValidationError(
+            {
+                'error_message': [
+                    "Some of the ordered products went out of stock, please try again."
+                ]
+            },
+            code='insufficient_quantity'
+        )
+
+    now = timezone.now()
+    StockReservation.objects.bulk_create([
+        StockReservation(
+            order=order_obj,
+            product_id=product_id,
+            quantity=quantity,
+            created_on=now,
+            modified_on=now,
+        )
+        for product_id, quantity in quantities.items()
+    ])
+
+
+def get_reserved_quantities(order_obj):
+    """
+    Returns reserved quantities of order per product id.
+    """
+    quantities = {}
+    reservations = order_obj.stock_reservations.filter(
+        status='Reserved',
+        product__isnull=False,
+    ).values_list('product', 'quantity')
+    for product_id, quantity in reservations:
+        quantities[product_id] = quantities.get(product_id, 0) + quantity
+    return quantities
+
+
+def complete_reservations(order_obj):
+    """
+    Marks order's reserved stock as sold with a single UPDATE, should be
+    called with the order locked so that stock is sold only once.
+
+    Orders placed before reservations existed still have their stock taken
+    off product quantity here.
+    """
+    if order_obj.stock_reservations.exists():
+        sold = get_reserved_quantities(order_obj)
+        to_take_off = {}
+    else:
+        sold = {}
+        ordered_products = order_obj.products.filter(product__isnull=False).values_list('product', 'quantity')
+        for product_id, quantity in ordered_products:
+            sold[product_id] = sold.get(product_id, 0) + quantity
+        to_take_off = sold
+
+    if sold:
+        Product.objects.filter(pk__in=sold).update(
+            quantity=F('quantity') - get_quantity_case(to_take_off),
+            items_sold=F('items_sold') + get_quantity_case(sold),
+        )
+    order_obj.stock_reservations.filter(status='Reserved').update(
+        status='Completed',
+        modified_on=timezone.now(),
+    )
+
+
+def release_reservations(order_obj):
+    """
+    Puts order's reserved stock back with a single UPDATE, should be
+    called with the order locked so that stock is put back only once.
+    """
+    released = get_reserved_quantities(order_obj)
+    if released:
+        Product.objects.filter(pk__in=released).update(
+            quantity=F('quantity') + get_quantity_case(released)
+        )
+    order_obj.stock_reservations.filter(status='Reserved').update(
+        status='Released',
+        modified_on=timezone.now(),
+    )
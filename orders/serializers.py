@@ -6,13 +6,10 @@ from .models import (
     PreOrderProductBundle,
 )
 from .utils import (
+    CartPricer,
     validate_payment,
-    validate_final_price_client_server,
-    validate_final_price_with_payment_obj,
-    is_quantity_less_than_or_equal_to,
     validate_final_price_client_server_for_pre_order,
     validate_final_price_of_pre_order_with_payment_obj,
-    validate_vat_calculation,
     validate_vat_calculation_for_preorder,
 )
 from users.serializers import (
@@ -102,16 +99,18 @@ class OrderSerializer(serializers.ModelSerializer):
             )
         
 
-        validate_vat_calculation(vat, cart_items)
-        validate_final_price_client_server(client_final_price, delivery_charge, discount, cart_items, vat)
-        is_quantity_less_than_or_equal_to(cart_items)
+        cart_pricer = CartPricer(cart_items)
+        cart_pricer.validate_vat(vat)
+        cart_pricer.validate_final_price(client_final_price, delivery_charge, discount, vat)
+        cart_pricer.validate_stock()
         payment_obj = validate_payment(payment_uuid, user)
-        validate_final_price_with_payment_obj(payment_obj, delivery_charge, discount, cart_items, vat)
+        cart_pricer.validate_payment_amount(payment_obj, delivery_charge, discount, vat)
         payment_obj.order_assigned=True
         payment_obj.save()
 
         data['final_price'] = payment_obj.amount
         data['payment_obj'] = payment_obj
+        data['cart_pricer'] = cart_pricer
         return data
     
 
@@ -0,0 +1,89 @@
+from celery import shared_task
+
+from products.recommender import Recommender
+from .models import Order, PreOrderProductBundle
+from .notify import (
+    notify_user_about_order_creation,
+    notify_admin_about_order_creation,
+    notify_user_about_pre_order_creation,
+    notify_admin_about_pre_order_creation,
+    send_order_create_mail_to_user,
+    send_pre_order_create_mail_to_user,
+)
+
+# side effects of checkout are retried independently of each other
+retry_options = {
+    'autoretry_for': (Exception,),
+    'retry_backoff': True,
+    'retry_backoff_max': 60 * 10,
+    'retry_kwargs': {'max_retries': 5},
+}
+
+
+@shared_task(**retry_options)
+def send_order_created_mail(order_id):
+    """
+    Sends order created mail to the user.
+    """
+    send_order_create_mail_to_user(order_id)
+
+
+# user and admins are notified by separate tasks, so that retrying one of
+# them never notifies the other twice
+
+@shared_task(**retry_options)
+def notify_user_about_order(order_id):
+    """
+    Notifies user about order creation.
+    """
+    notify_user_about_order_creation(Order.objects.select_related('user').get(pk=order_id))
+
+
+@shared_task(**retry_options)
+def notify_admins_about_order(order_id):
+    """
+    Notifies admins about order creation.
+    """
+    notify_admin_about_order_creation(Order.objects.select_related('user').get(pk=order_id))
+
+
+@shared_task(**retry_options)
+def record_order_products_bought_together(order_id):
+    """
+    Updates bought together scores of products in the order.
+    """
+    product_ids = list(
+        Order.objects.get(pk=order_id).products
+        .filter(product__isnull=False)
+        .values_list('product', flat=True)
+    )
+    # recorded once per order, so retries never count an order twice
+    Recommender().order_bought(order_id, product_ids)
+
+
+@shared_task(**retry_options)
+def send_pre_order_created_mail(pre_order_id):
+    """
+    Sends pre-order created mail to the user.
+    """
+    send_pre_order_create_mail_to_user(pre_order_id)
+
+
+@shared_task(**retry_options)
+def notify_user_about_pre_order(pre_order_id):
+    """
+    Notifies user about pre-order creation.
+    """
+    notify_user_about_pre_order_creation(
+        PreOrderProductBundle.objects.select_related('user').get(pk=pre_order_id)
+    )
+
+
+@shared_task(**retry_options)
+def notify_admins_about_pre_order(pre_order_id):
+    """
+    Notifies admins about pre-order creation.
+    """
+    notify_admin_about_pre_order_creation(
+        PreOrderProductBundle.objects.select_related('user').get(pk=pre_order_id)
+    )
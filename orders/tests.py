@@ -1,3 +1,134 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.db import transaction
 from django.test import TestCase
+from rest_framework import serializers
+from rest_framework.test import APIClient
+
+from core.models import PaymentMethod
+from payments.models import Payment
+from products.models import Category, SubCategory, Product
+from users.models import User
+from .models import Order, StockReservation
+from .reservations import reserve_stock, complete_reservations, release_reservations
+from .utils import CartPricer
+
+
+class StockReservationTestCase(TestCase):
+    """
+    Ordered stock is taken off on checkout and sold or put back only once.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin@example.com', 'password')
+        sub_category = SubCategory.objects.create(
+            category=Category.objects.create(name='Phones'),
+            name='Smart Phones',
+        )
+        cls.phone = Product.objects.create(
+            name='Phone', sub_category=sub_category, quantity=10, selling_price=Decimal('100.00'),
+        )
+        cls.case = Product.objects.create(
+            name='Case', sub_category=sub_category, quantity=1, selling_price=Decimal('10.00'),
+        )
+        cls.method = PaymentMethod.objects.create(method_name='Esewa', slug='esewa')
+
+    def create_order(self):
+        payment = Payment.objects.create(
+            method=self.method,
+            payment_status='verified',
+            amount=Decimal('100.00'),
+        )
+        return Order.objects.create(
+            payment=payment,
+            order_uuid=str(payment.payment_uuid),
+            final_price=Decimal('100.00'),
+        )
+
+    def reserve(self, order_obj, cart_items):
+        with transaction.atomic():
+            reserve_stock(order_obj, CartPricer(cart_items))
+
+    def assertQuantities(self, phone_quantity, case_quantity):
+        self.phone.refresh_from_db()
+        self.case.refresh_from_db()
+        self.assertEqual(self.phone.quantity, phone_quantity)
+        self.assertEqual(self.case.quantity, case_quantity)
+
+    def test_reserve_stock(self):
+        order_obj = self.create_order()
+        self.reserve(order_obj, [
+            {'product_id': self.phone.pk, 'quantity': 2},
+            {'product_id': self.phone.pk, 'quantity': 1},
+            {'product_id': self.case.pk, 'quantity': 1},
+        ])
+        self.assertQuantities(7, 0)
+        self.assertEqual(
+            dict(order_obj.stock_reservations.values_list('product', 'quantity')),
+            {self.phone.pk: 3, self.case.pk: 1},
+        )
+
+    def test_reserve_insufficient_stock(self):
+        order_obj = self.create_order()
+        with self.assertRaises(serializers.ValidationError) as error:
+            self.reserve(order_obj, [
+                {'product_id': self.phone.pk, 'quantity': 2},
+                {'product_id': self.case.pk, 'quantity': 2},
+            ])
+        self.assertEqual(error.exception.get_codes(), {'error_message': ['insufficient_quantity']})
+        self.assertQuantities(10, 1)
+        self.assertFalse(StockReservation.objects.exists())
+
+    def test_reserve_stock_restocked_meanwhile(self):
+        order_obj = self.create_order()
+        # stock read after the update is enough again, still nothing was taken
+        with mock.patch('orders.reservations.check_product_quantity', return_value=True):
+            with self.assertRaises(serializers.ValidationError):
+                self.reserve(order_obj, [
+                    {'product_id': self.phone.pk, 'quantity': 2},
+                    {'product_id': self.case.pk, 'quantity': 2},
+                ])
+        self.assertQuantities(10, 1)
+        self.assertFalse(StockReservation.objects.exists())
+
+    def test_complete_reservations(self):
+        order_obj = self.create_order()
+        self.reserve(order_obj, [{'product_id': self.phone.pk, 'quantity': 2}])
+        complete_reservations(order_obj)
+        complete_reservations(order_obj)
+        self.assertQuantities(8, 1)
+        self.phone.refresh_from_db()
+        self.assertEqual(self.phone.items_sold, 2)
+        self.assertEqual(order_obj.stock_reservations.get().status, 'Completed')
+
+    def test_release_reservations(self):
+        order_obj = self.create_order()
+        self.reserve(order_obj, [{'product_id': self.phone.pk, 'quantity': 2}])
+        release_reservations(order_obj)
+        release_reservations(order_obj)
+        self.assertQuantities(10, 1)
+        self.assertEqual(order_obj.stock_reservations.get().status, 'Released')
+
+    def test_cancel_order_twice(self):
+        order_obj = self.create_order()
+        self.reserve(order_obj, [{'product_id': self.phone.pk, 'quantity': 2}])
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        response = client.post('/api/orders/mark-cancel/', {'order_id': order_obj.pk})
+        self.assertEqual(response.status_code, 200)
+        response = client.post('/api/orders/mark-cancel/', {'order_id': order_obj.pk})
+        self.assertEqual(response.status_code, 423)
+        self.assertQuantities(10, 1)
 
-# Create your tests here.
+    def test_complete_order(self):
+        order_obj = self.create_order()
+        self.reserve(order_obj, [{'product_id': self.phone.pk, 'quantity': 2}])
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        response = client.post('/api/orders/mark-complete/', {'order_id': order_obj.pk})
+        self.assertEqual(response.status_code, 200)
+        response = client.post('/api/orders/mark-cancel/', {'order_id': order_obj.pk})
+        self.assertEqual(response.status_code, 423)
+        self.assertQuantities(8, 1)
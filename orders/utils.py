@@ -2,6 +2,7 @@ from decimal import Decimal
 from datetime import timedelta
 from django.core.exceptions import ObjectDoesNotExist, MultipleObjectsReturned
 from django.utils import timezone
+from django.utils.functional import cached_property
 from rest_framework import serializers
 from payments.models import Payment
 from products.models import Product
@@ -40,41 +41,6 @@ def validate_payment(payment_uuid, user):
     return payment_obj
 
 
-def get_product_obj(product_id):
-    """
-    Raises validation error or returns product_obj.
-    """
-    try:
-        product_obj = Product.objects.get(pk=product_id)
-    except ObjectDoesNotExist or MultipleObjectsReturned:
-        raise serializers.ValidationError(
-            {
-                'error_message': [
-                    f"Product with product_id:{product_id} doesn't exist."
-                ]
-            },
-            code='invalid_product_id'
-        )
-    return product_obj
-
-
-def calculate_final_price(delivery_charge, discount, cart_items, vat):
-    """
-    Calculates final price from cart items.
-    """
-    product_price_list = []
-    for cart_item in cart_items:
-        product_id = cart_item.get('product_id', None)
-        product_quantity = cart_item.get('quantity', None)
-        product_obj = get_product_obj(product_id)
-        per_product_price = product_obj.selling_price
-        product_price = per_product_price * product_quantity
-        product_price_list.append(product_price)
-    products_price =  sum(product_price_list)
-    calculated_final_price = products_price + delivery_charge - discount + vat
-    return calculated_final_price, products_price
-
-
 def get_vat_percentage():
     """
     Returns vat percentage to be added to the total_products_price during checkout.
@@ -94,60 +60,6 @@ def get_vat_percentage():
     return vat
 
 
-def validate_vat_calculation(client_calculated_vat, cart_items):
-    """
-    Returns True or raises validation error if server calculated vat is not
-    equal to client calculated vat
-    """
-    _, products_price = calculate_final_price(0, 0, cart_items, 0)
-    vat_in_percentage_to_be_applied = get_vat_percentage()
-    server_calculated_vat = (vat_in_percentage_to_be_applied * products_price) / 100
-    if int(server_calculated_vat) != int(client_calculated_vat):
-        raise serializers.ValidationError(
-            {
-                'error_message': [
-                    f"Client calculated vat: {client_calculated_vat}. Server calculated vat: {server_calculated_vat}"
-                ]
-            },
-            code='vat_conflict'
-        )
-    return True
-
-
-def validate_final_price_client_server(client_final_price, delivery_charge, discount, cart_items, vat):
-    """
-    Returns True or raises validation error.
-    """
-    calculated_final_price, _ = calculate_final_price(delivery_charge, discount, cart_items, vat)
-    if int(calculated_final_price) != int(client_final_price):
-        raise serializers.ValidationError(
-            {
-                'error_message': [
-                    f"Client final price: {client_final_price}. Server final price: {calculated_final_price}"
-                ]
-            },
-            code='invalid_final_price'
-        )
-    return True
-
-
-def validate_final_price_with_payment_obj(payment_obj, delivery_charge, discount, cart_items, vat):
-    """
-    Returns True or raises validation error.
-    """
-    calculated_final_price, _ = calculate_final_price(delivery_charge, discount, cart_items, vat)
-    if payment_obj.amount < int(calculated_final_price):
-        raise serializers.ValidationError(
-            {
-                'error_message': [
-                    f"You ordered products worth {calculated_final_price}  but paid {payment_obj.amount}"
-                ]
-            },
-            code='insufficient_payment'
-        )
-    return True
-
-
 def check_product_quantity(product_obj, product_quantity):
     """
     Returns True if product_quantity is less than or equal to product_obj quantity.
@@ -164,24 +76,118 @@ def check_product_quantity(product_obj, product_quantity):
     )
     
 
-def is_quantity_less_than_or_equal_to(cart_items):
+class CartPricer(object):
     """
-    Returns True if ordered quantity is less than or equal to the stock quantity.
+    Prices cart items and validates checkout against them, loading all
+    cart products with a single query.
     """
-    for cart_item in cart_items:
-        product_id = cart_item.get('product_id', None)
-        product_quantity = cart_item.get('quantity', None)
-        product_obj = get_product_obj(product_id)
-        check_product_quantity(product_obj, product_quantity)
-    return True
+
+    def __init__(self, cart_items):
+        self.cart_items = cart_items
+        product_ids = [cart_item.get('product_id', None) for cart_item in cart_items]
+        products = Product.objects.in_bulk(
+            [product_id for product_id in product_ids if str(product_id).isdigit()]
+        )
+        self.items = []
+        for cart_item, product_id in zip(cart_items, product_ids):
+            product_obj = products.get(int(product_id)) if str(product_id).isdigit() else None
+            if product_obj is None:
+                raise serializers.ValidationError(
+                    {
+                        'error_message': [
+                            f"Product with product_id:{product_id} doesn't exist."
+                        ]
+                    },
+                    code='invalid_product_id'
+                )
+            self.items.append((cart_item, product_obj))
+        self.products_price = sum(
+            product_obj.selling_price * cart_item.get('quantity', None)
+            for cart_item, product_obj in self.items
+        )
+
+    @cached_property
+    def vat_in_percentage(self):
+        return get_vat_percentage()
+
+    @cached_property
+    def vat(self):
+        return (self.vat_in_percentage * self.products_price) / 100
+
+    def get_final_price(self, delivery_charge, discount, vat):
+        return self.products_price + delivery_charge - discount + vat
+
+    def validate_vat(self, client_calculated_vat):
+        """
+        Returns True or raises validation error if server calculated vat is not
+        equal to client calculated vat
+        """
+        if int(self.vat) != int(client_calculated_vat):
+            raise serializers.ValidationError(
+                {
+                    'error_message': [
+                        f"Client calculated vat: {client_calculated_vat}. Server calculated vat: {self.vat}"
+                    ]
+                },
+                code='vat_conflict'
+            )
+        return True
+
+    def validate_final_price(self, client_final_price, delivery_charge, discount, vat):
+        """
+        Returns True or raises validation error.
+        """
+        calculated_final_price = self.get_final_price(delivery_charge, discount, vat)
+        if int(calculated_final_price) != int(client_final_price):
+            raise serializers.ValidationError(
+                {
+                    'error_message': [
+                        f"Client final price: {client_final_price}. Server final price: {calculated_final_price}"
+                    ]
+                },
+                code='invalid_final_price'
+            )
+        return True
+
+    def validate_payment_amount(self, payment_obj, delivery_charge, discount, vat):
+        """
+        Returns True or raises validation error.
+        """
+        calculated_final_price = self.get_final_price(delivery_charge, discount, vat)
+        if payment_obj.amount < int(calculated_final_price):
+            raise serializers.ValidationError(
+                {
+                    'error_message': [
+                        f"You ordered products worth {calculated_final_price}  but paid {payment_obj.amount}"
+                    ]
+                },
+                code='insufficient_payment'
+            )
+        return True
+
+    def validate_stock(self):
+        """
+        Returns True if ordered quantity of every product, summed over
+        cart items, is less than or equal to the stock quantity.
+        """
+        ordered_quantities = {}
+        for cart_item, product_obj in self.items:
+            ordered_quantities[product_obj] = (
+                ordered_quantities.get(product_obj, 0) + cart_item.get('quantity', None)
+            )
+        for product_obj, product_quantity in ordered_quantities.items():
+            check_product_quantity(product_obj, product_quantity)
+        return True
 
 
-def get_order_obj(order_id):
+def get_order_obj(order_id, lock=False):
     """
-    Raises validation error or returns order_obj.
+    Raises validation error or returns order_obj, locked till the end of
+    the current transaction if lock is True.
     """
+    orders = Order.objects.select_for_update() if lock else Order.objects
     try:
-        order_obj = Order.objects.get(pk=order_id)
+        order_obj = orders.get(pk=order_id)
     except ObjectDoesNotExist or MultipleObjectsReturned:
         raise serializers.ValidationError(
             {
@@ -2,9 +2,10 @@
 from datetime import timedelta
 from decimal import Decimal
 from django.core.exceptions import ObjectDoesNotExist, MultipleObjectsReturned
+from django.db import transaction
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
-from django.db.models import Avg, Max, Min, F
+from django.db.models import Avg, Max, Min, F, Prefetch, prefetch_related_objects
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.response import Response
@@ -27,9 +28,7 @@ from .models import (
     OrderProduct,
     PreOrderProductBundle,
 )
-from products.models import (
-    Product
-)
+from users.models import User
 from .serializers import (
     PromoCodeSerializer,
     OrderSerializer,
@@ -39,13 +38,12 @@ from .serializers import (
     PreOrderCheckoutCalculationSerializer,
 )
 from .utils import (
-    get_product_obj,
+    CartPricer,
     get_order_obj,
     get_pre_order_obj,
     generate_order_uuid,
     generate_pre_order_uuid,
     get_estimated_delivery_date,
-    calculate_final_price,
     get_vat_percentage,
     get_promocode_discount_if_valid,
 )
@@ -55,15 +53,15 @@ from users.utils import (
 from products.utils import (
     get_product_bundle_for_pre_order_obj,
 )
-from .notify import (
-    notify_user_about_order_creation,
-    notify_admin_about_order_creation,
-    notify_user_about_pre_order_creation,
-    notify_admin_about_pre_order_creation,
-    send_order_create_mail_to_user,
-    send_pre_order_create_mail_to_user
+from .reservations import (
+    reserve_stock,
+    complete_reservations,
+    release_reservations,
+)
+from .events import (
+    publish_order_created,
+    publish_pre_order_created,
 )
-from products.recommender import Recommender
 
 
 class PromoCodeAPIViewSet(ModelViewSet):
@@ -120,8 +118,21 @@ class CheckOutCreateAPIView(CreateAPIView):
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        order_obj = self.perform_create_order(serializer)
+        with transaction.atomic():
+            serializer.is_valid(raise_exception=True)
+            order_obj = self.perform_create_order(serializer)
+        prefetch_related_objects(
+            [order_obj],
+            Prefetch(
+                'products',
+                queryset=OrderProduct.objects.select_related(
+                    'product__brand',
+                    'product__sub_category__category',
+                    'product__deal_of_the_day',
+                    'product__todays_popular_pick',
+                )
+            )
+        )
         return Response(
             {
                 "message":"successfully ordered.",
@@ -137,7 +148,12 @@ class CheckOutCreateAPIView(CreateAPIView):
         shipping = serializer.validated_data.get('shipping')
         vat = serializer.validated_data.get('vat')
         sub_total = serializer.validated_data.get('products_price')
+        cart_pricer = serializer.validated_data.get('cart_pricer')
         estimated_delivery_date = get_estimated_delivery_date(shipping.area.delivery_duration)
+        reward_points = sum(
+            product_obj.reward_points * cart_item.get('quantity', None)
+            for cart_item, product_obj in cart_pricer.items
+        )
 
         order_obj = Order.objects.create(
             user = self.request.user,
@@ -148,60 +164,60 @@ class CheckOutCreateAPIView(CreateAPIView):
             vat = vat,
             sub_total = sub_total,
             final_price = final_price,
-            estimated_delivery_date = estimated_delivery_date
+            estimated_delivery_date = estimated_delivery_date,
+            reward_points = reward_points,
         )
         order_obj.order_uuid = generate_order_uuid(order_obj.pk)
-        order_obj.save()
+        order_obj.save(update_fields=['order_uuid', 'modified_on'])
+        reserve_stock(order_obj, cart_pricer)
         self.perform_create_order_product(serializer, order_obj)
         return order_obj
 
     def perform_create_order_product(self, serializer, order_obj):
         """
-        Create order product object.
+        Create order product objects in bulk.
         """
-        cart_items = serializer.validated_data.get('cart_items')
-        for cart_item in cart_items:
-            product_id = cart_item.get('product_id', None)
+        cart_pricer = serializer.validated_data.get('cart_pricer')
+        now = timezone.now()
+        order_products = []
+        for cart_item, product_obj in cart_pricer.items:
             product_quantity = cart_item.get('quantity', None)
-            product_obj = get_product_obj(product_id)
             rate = product_obj.selling_price
             net_total = rate * product_quantity
 
             color = cart_item.get('color', '')
 
-            OrderProduct.objects.create(
-                user = self.request.user,
-                product = product_obj,
-                order = order_obj,
-                color = color,
-                quantity = product_quantity,
-                rate = rate,
-                net_total = net_total,
-                estimated_delivery_date = order_obj.estimated_delivery_date  
+            # bulk_create skips BaseModel.save, so timestamps are set here
+            order_products.append(
+                OrderProduct(
+                    user = self.request.user,
+                    product = product_obj,
+                    order = order_obj,
+                    color = color,
+                    quantity = product_quantity,
+                    rate = rate,
+                    net_total = net_total,
+                    estimated_delivery_date = order_obj.estimated_delivery_date,
+                    created_on = now,
+                    modified_on = now,
+                )
             )
-            order_obj.reward_points += (product_obj.reward_points) * product_quantity
-
-            # add reward points to user's account
-            self.perform_add_reward_points_to_user_account(product_obj, product_quantity)
-        send_order_create_mail_to_user(order_obj)
-        notify_user_about_order_creation(order_obj)
-        notify_admin_about_order_creation(order_obj)
-        self.set_products_bought_together(order_obj)
+        OrderProduct.objects.bulk_create(order_products)
+
+        # add reward points to user's account
+        self.perform_add_reward_points_to_user_account(order_obj.reward_points)
+        publish_order_created(order_obj)
     
-    def perform_add_reward_points_to_user_account(self, product_obj, product_quantity):
+    def perform_add_reward_points_to_user_account(self, reward_points):
         """
-        adds reward points to user's account after purchasing an item.
+        adds reward points to user's account after purchasing items.
         """
+        if not reward_points:
+            return
         user = self.request.user
-        product_reward_points = (product_obj.reward_points * product_quantity)
-        user.reward_points += product_reward_points
-        user.save()
+        User.objects.filter(pk=user.pk).update(reward_points=F('reward_points') + reward_points)
+        user.refresh_from_db(fields=['reward_points'])
 
-    def set_products_bought_together(self, order_obj):
-        products = order_obj.products.values_list('product', flat=True)
-        recommender = Recommender()
-        recommender.products_bought(products)
-        
     def get_serializer_context(self):
         """
         Extra context provided to the serializer class.
@@ -256,37 +272,33 @@ class MarkOrderAsCompletedAPIView(APIView):
 
     def post(self, request, *args, **kwargs):
         order_id = request.data.get('order_id', None)
-        order_obj = get_order_obj(order_id)
-        if order_obj.delivery_status=='Completed':
-            return Response(
-                {
-                    'error_message': 'Order is already completed.'
-                },
-                status.HTTP_423_LOCKED
-            )
-        if order_obj.delivery_status=='Cancelled':
-            return Response(
-                {
-                    'error_message': 'Order is already cancelled.'
-                },
-                status.HTTP_423_LOCKED
-            )
-        order_obj.delivery_status = 'Completed'
-        order_obj.delivered_at = timezone.now().date()
-        order_obj.save()
-
-        order_obj.products.update(
-            delivery_status='Completed',
-            delivered_at = timezone.now().date()
-        )
+        with transaction.atomic():
+            # order stays locked till commit, so that concurrent requests
+            # see its new status and don't take or put back stock twice
+            order_obj = get_order_obj(order_id, lock=True)
+            if order_obj.delivery_status=='Completed':
+                return Response(
+                    {
+                        'error_message': 'Order is already completed.'
+                    },
+                    status.HTTP_423_LOCKED
+                )
+            if order_obj.delivery_status=='Cancelled':
+                return Response(
+                    {
+                        'error_message': 'Order is already cancelled.'
+                    },
+                    status.HTTP_423_LOCKED
+                )
+            order_obj.delivery_status = 'Completed'
+            order_obj.delivered_at = timezone.now().date()
+            order_obj.save()
 
-        for ordered_product in order_obj.products.all():
-            Product.objects.filter(
-                pk=ordered_product.product.pk
-            ).update(
-                quantity=F('quantity') - ordered_product.quantity, 
-                items_sold=F('items_sold') + ordered_product.quantity
+            order_obj.products.update(
+                delivery_status='Completed',
+                delivered_at = timezone.now().date()
             )
+            complete_reservations(order_obj)
 
         return Response(
             {
@@ -304,29 +316,33 @@ class MarkOrderAsCancelledAPIView(APIView):
 
     def post(self, request, *args, **kwargs):
         order_id = request.data.get('order_id', None)
-        order_obj = get_order_obj(order_id)
-        if order_obj.delivery_status=='Completed':
-            return Response(
-                {
-                    'error_message': 'Order is already completed.'
-                },
-                status.HTTP_423_LOCKED
-            )
-        if order_obj.delivery_status=='Cancelled':
-            return Response(
-                {
-                    'error_message': 'Order is already cancelled.'
-                },
-                status.HTTP_423_LOCKED
-            )
-        order_obj.delivery_status = 'Cancelled'
-        order_obj.delivered_at = None
-        order_obj.save()
+        with transaction.atomic():
+            # order stays locked till commit, so that concurrent requests
+            # see its new status and don't take or put back stock twice
+            order_obj = get_order_obj(order_id, lock=True)
+            if order_obj.delivery_status=='Completed':
+                return Response(
+                    {
+                        'error_message': 'Order is already completed.'
+                    },
+                    status.HTTP_423_LOCKED
+                )
+            if order_obj.delivery_status=='Cancelled':
+                return Response(
+                    {
+                        'error_message': 'Order is already cancelled.'
+                    },
+                    status.HTTP_423_LOCKED
+                )
+            order_obj.delivery_status = 'Cancelled'
+            order_obj.delivered_at = None
+            order_obj.save()
 
-        order_obj.products.update(
-            delivery_status='Cancelled',
-            delivered_at=None
-        )
+            order_obj.products.update(
+                delivery_status='Cancelled',
+                delivered_at=None
+            )
+            release_reservations(order_obj)
 
         return Response(
             {
@@ -392,9 +408,7 @@ class PreOrderCheckOutCreateAPIView(CreateAPIView):
         user.reward_points += reward_points
         user.save()
 
-        send_pre_order_create_mail_to_user(pre_order_product_bundle_obj)
-        notify_user_about_pre_order_creation(pre_order_product_bundle_obj)
-        notify_admin_about_pre_order_creation(pre_order_product_bundle_obj)
+        publish_pre_order_created(pre_order_product_bundle_obj)
         return pre_order_product_bundle_obj
 
     def get_serializer_context(self):
@@ -510,16 +524,16 @@ class OrderCheckoutCalculationAPIView(APIView):
         shipping_id = serializer.validated_data.get('shipping')
         shipping_obj = get_shipping_obj(shipping_id)
 
-        _, products_price = calculate_final_price(0, 0, cart_items, 0)
-        vat_in_percentage_to_be_applied = get_vat_percentage()
-        vat = (vat_in_percentage_to_be_applied * products_price) / 100
+        cart_pricer = CartPricer(cart_items)
+        products_price = cart_pricer.products_price
+        vat = cart_pricer.vat
         delivery_charge = shipping_obj.area.delivery_charge
 
         total_price = products_price + vat + delivery_charge
         data = {
             'products_price': products_price,
             'vat': vat,
-            'vat_in_percentage': vat_in_percentage_to_be_applied,
+            'vat_in_percentage': cart_pricer.vat_in_percentage,
             'delivery_charge': delivery_charge,
             'final_price': total_price,
         }
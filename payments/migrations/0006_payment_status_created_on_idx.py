@@ -0,0 +1,17 @@
+# Generated by Django 3.2 on 2026-10-18 17:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0005_cardpayment_fonepaypayment_imepay_khaltipayment'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['payment_status', 'order_assigned', 'created_on'], name='payment_status_created_on_idx'),
+        ),
+    ]
@@ -110,5 +110,13 @@ class Payment(BaseModel):
     payment_uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     order_assigned = models.BooleanField(default=False, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['payment_status', 'created_on'],
+                name='payment_status_created_on_idx',
+            ),
+        ]
+
     def __str__(self):
         return f'{self.payment_uuid}'
@@ -0,0 +1,98 @@
+import uuid
+from django.db.models import F, Case, When, Value, PositiveIntegerField
+from redis.exceptions import ResponseError
+
+from common.redis_client import redis_connection as r
+from .models import Product
+
+
+class ProductViewCounter(object):
+    """
+    Buffers product views in redis and flushes them to Product.views_count
+    in bulk, so that viewing a product never writes the product row.
+    """
+    pending_key = 'products:views_count:pending'
+    flushing_keys_key = 'products:views_count:flushing'
+    flush_lock_key = 'products:views_count:flush_lock'
+    # seconds a flush may take before another one can start
+    flush_lock_timeout = 60 * 10
+    flush_batch_size = 1000
+
+    def increment(self, product_id, amount=1):
+        r.hincrby(self.pending_key, product_id, amount)
+
+    def flush(self):
+        """
+        Adds buffered views to Product.views_count and returns number of
+        products updated, nothing is flushed while another flush runs.
+        """
+        lock = r.lock(self.flush_lock_key, timeout=self.flush_lock_timeout)
+        if not lock.acquire(blocking=False):
+            return 0
+        try:
+            return self.flush_pending()
+        finally:
+            lock.release()
+
+    def flush_pending(self):
+        updated = 0
+        # views moved aside by a flush that couldn't read them
+        for flushing_key in r.smembers(self.flushing_keys_key):
+            updated += self.flush_key(flushing_key.decode())
+
+        # move buffered views aside, views received from now on are buffered
+        # for the next flush.
+        flushing_key = f'{self.pending_key}:flushing:{uuid.uuid4().hex}'
+        r.sadd(self.flushing_keys_key, flushing_key)
+        try:
+            r.rename(self.pending_key, flushing_key)
+        except ResponseError:
+            # no views buffered since the last flush
+            r.srem(self.flushing_keys_key, flushing_key)
+            return updated
+        return updated + self.flush_key(flushing_key)
+
+    def flush_key(self, flushing_key):
+        """
+        Adds views moved aside to flushing_key to Product.views_count.
+        """
+        views = None
+        updated = 0
+        try:
+            views = {
+                int(product_id): int(count)
+                for product_id, count in r.hgetall(flushing_key).items()
+            }
+            product_ids = list(views)
+            for i in range(0, len(product_ids), self.flush_batch_size):
+                batch = product_ids[i:i + self.flush_batch_size]
+                updated += self.add_views(batch, views)
+                for product_id in batch:
+                    del views[product_id]
+        finally:
+            # if views couldn't be read they stay in flushing_key for the
+            # next flush, otherwise whatever couldn't be written is buffered
+            # back so the next flush retries it
+            if views is not None:
+                pipe = r.pipeline()
+                for product_id, count in views.items():
+                    pipe.hincrby(self.pending_key, product_id, count)
+                pipe.delete(flushing_key)
+                pipe.srem(self.flushing_keys_key, flushing_key)
+                pipe.execute()
+        return updated
+
+    def add_views(self, product_ids, views):
+        """
+        Adds views to given products with a single UPDATE ... CASE statement.
+        """
+        views_to_add = Case(
+            *[When(pk=product_id, then=Value(views[product_id])) for product_id in product_ids],
+            default=Value(0),
+            output_field=PositiveIntegerField(),
+        )
+        return (
+            Product.objects
+            .filter(pk__in=product_ids)
+            .update(views_count=F('views_count') + views_to_add)
+        )
@@ -1,5 +1,9 @@
+import re
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, Q
 from django_filters import rest_framework as filters
 from django_filters.widgets import CSVWidget
+from rest_framework.filters import SearchFilter
 from .models import Product, SubCategory, Brand
 
 
@@ -23,4 +27,46 @@ class ProductFilterSet(filters.FilterSet):
             'sub_category', 'sub_category__slug', 'sub_category__category',
             'sub_category__category__slug', 'brand', 'selling_price',
             'min_avg_rating', 'is_featured',
-        )
\ No newline at end of file
+        )
+
+
+class ProductSearchFilter(SearchFilter):
+    """
+    Full text search on Product.search_vector, ordered by rank.
+    Every search term is matched as a prefix, so partially typed words match too.
+    Products whose sub category name or description contains every search term
+    match as well, ranked after the full text matches.
+    """
+
+    def get_sub_category_query(self, search_terms):
+        query = Q()
+        for search_term in search_terms:
+            query &= Q(
+                sub_category__in=SubCategory.objects.filter(
+                    Q(name__icontains=search_term) | Q(description__icontains=search_term)
+                )
+            )
+        return query
+
+    def get_search_query(self, search_terms):
+        words = re.findall(r'\w+', ' '.join(search_terms))
+        if not words:
+            return None
+        return SearchQuery(
+            ' & '.join(f'{word}:*' for word in words),
+            search_type='raw',
+        )
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        search_query = self.get_search_query(search_terms)
+        if search_query is None:
+            return queryset
+        return (
+            queryset
+            .filter(
+                Q(search_vector=search_query) | self.get_sub_category_query(search_terms)
+            )
+            .annotate(rank=SearchRank(F('search_vector'), search_query))
+            .order_by('-rank', '-id')
+        )
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from products.recommender import Recommender
+from products.utils import get_ordered_product_ids_by_order
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds products bought together scores from ordered products.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Clear existing scores before back-filling.',
+        )
+
+    def handle(self, *args, **options):
+        recommender = Recommender()
+        if options['clear']:
+            recommender.clear_purchases()
+        recommender.orders_bought(get_ordered_product_ids_by_order())
+        self.stdout.write(self.style.SUCCESS('Back-filled products bought together.'))
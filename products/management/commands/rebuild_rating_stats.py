@@ -0,0 +1,42 @@
+from collections import defaultdict
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from products.models import Product, RatingAndReview
+from products.utils import RATING_COUNT_FIELDS, get_average_rating_expression
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds rating counters and average rating of all products from their reviews.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        rating_counts = defaultdict(dict)
+        reviews = (
+            RatingAndReview.objects
+            .order_by()
+            .values_list('product', 'rating')
+            .annotate(count=Count('id'))
+        )
+        for product_id, rating, count in reviews:
+            rating_counts[product_id][rating] = count
+
+        fields = ['rating_count', *RATING_COUNT_FIELDS.values()]
+        products = []
+        for product_id, counts in rating_counts.items():
+            product = Product(pk=product_id, rating_count=sum(counts.values()))
+            for star, field_name in RATING_COUNT_FIELDS.items():
+                setattr(product, field_name, counts.get(star, 0))
+            products.append(product)
+
+        with transaction.atomic():
+            Product.objects.update(**dict.fromkeys(fields, 0))
+            Product.objects.bulk_update(products, fields, batch_size=options['batch_size'])
+            Product.objects.update(average_rating=get_average_rating_expression())
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt rating stats of {len(products)} reviewed products.')
+        )
@@ -0,0 +1,19 @@
+from django.db import models
+
+
+class ProductQuerySet(models.QuerySet):
+    """
+    QuerySet with helpers to load products for serialization.
+    """
+
+    def for_listing(self):
+        """
+        Returns products with everything ProductSerializer reads, so that
+        serializing a page costs a constant number of queries.
+        """
+        return self.select_related(
+            'brand',
+            'sub_category__category',
+            'deal_of_the_day',
+            'todays_popular_pick',
+        )
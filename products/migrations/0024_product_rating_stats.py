@@ -0,0 +1,75 @@
+# Generated by Django 3.2 on 2026-10-18 17:16
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+RATING_COUNT_FIELDS = {
+    1: 'one_star_count',
+    2: 'two_stars_count',
+    3: 'three_stars_count',
+    4: 'four_stars_count',
+    5: 'five_stars_count',
+}
+
+
+def backfill_rating_stats(apps, schema_editor):
+    Product = apps.get_model('products', 'Product')
+    RatingAndReview = apps.get_model('products', 'RatingAndReview')
+    products = {}
+    reviews = (
+        RatingAndReview.objects
+        .order_by()
+        .values_list('product', 'rating')
+        .annotate(count=Count('id'))
+    )
+    for product_id, rating, count in reviews:
+        product = products.setdefault(product_id, Product(pk=product_id, rating_count=0))
+        setattr(product, RATING_COUNT_FIELDS[rating], count)
+        product.rating_count += count
+    Product.objects.bulk_update(
+        products.values(),
+        ['rating_count', *RATING_COUNT_FIELDS.values()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0023_productbundleforpreorder_reward_points'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='five_stars_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='five stars count'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='four_stars_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='four stars count'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='one_star_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='one star count'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, help_text='number of ratings and reviews on this product.', verbose_name='rating count'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='three_stars_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='three stars count'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='two_stars_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='two stars count'),
+        ),
+        migrations.RunPython(backfill_rating_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 3.2 on 2026-10-18 17:17
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+SEARCH_VECTOR = """
+    setweight(to_tsvector(coalesce({table}.name, '')), 'A') ||
+    setweight(to_tsvector(coalesce({table}.overview, '')), 'B')
+"""
+
+CREATE_TRIGGER = f"""
+CREATE FUNCTION products_product_search_vector_trigger() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := {SEARCH_VECTOR.format(table='NEW')};
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER products_product_search_vector_update
+BEFORE INSERT OR UPDATE OF name, overview ON products_product
+FOR EACH ROW EXECUTE PROCEDURE products_product_search_vector_trigger();
+
+UPDATE products_product SET search_vector = {SEARCH_VECTOR.format(table='products_product')};
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS products_product_search_vector_update ON products_product;
+DROP FUNCTION IF EXISTS products_product_search_vector_trigger();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0024_product_rating_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='weighted name and overview, kept up to date by a database trigger.', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='product_search_vector_idx'),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+    ]
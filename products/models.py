@@ -1,4 +1,6 @@
 import os
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils.text import slugify
@@ -7,6 +9,7 @@ from django.db.models import Avg, Max, Min
 from django.utils import timezone
 
 from common.models import SEOBaseModel, TimeStampedModel, BaseModel
+from .managers import ProductQuerySet
 
 
 class Category(SEOBaseModel):
@@ -140,6 +143,18 @@ class Product(SEOBaseModel):
             'average rating calculated from ratings and reviews table.'
         )
     )
+    rating_count = models.PositiveIntegerField(
+        _('rating count'),
+        default=0,
+        help_text=_(
+            'number of ratings and reviews on this product.'
+        )
+    )
+    one_star_count = models.PositiveIntegerField(_('one star count'), default=0)
+    two_stars_count = models.PositiveIntegerField(_('two stars count'), default=0)
+    three_stars_count = models.PositiveIntegerField(_('three stars count'), default=0)
+    four_stars_count = models.PositiveIntegerField(_('four stars count'), default=0)
+    five_stars_count = models.PositiveIntegerField(_('five stars count'), default=0)
     views_count = models.PositiveIntegerField(
         _('views count'),
         default=0,
@@ -156,10 +171,22 @@ class Product(SEOBaseModel):
             'points given to user after purchasing this product.'
         )
     )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        help_text=_(
+            'weighted name and overview, kept up to date by a database trigger.'
+        )
+    )
+
+    objects = ProductQuerySet.as_manager()
 
     class Meta:
         verbose_name = _('Product')
         verbose_name_plural = _('Products')
+        indexes = (
+            GinIndex(fields=('search_vector',), name='product_search_vector_idx'),
+        )
     
     def __str__(self):
         return f'{self.name}'
@@ -171,7 +198,19 @@ class Product(SEOBaseModel):
 
     @property
     def count_of_users_who_rated(self):
-        return self.reviews.count()
+        return self.rating_count
+
+    def get_rating_counts(self):
+        """
+        Returns dict of star and number of reviews with that rating.
+        """
+        return {
+            1: self.one_star_count,
+            2: self.two_stars_count,
+            3: self.three_stars_count,
+            4: self.four_stars_count,
+            5: self.five_stars_count,
+        }
 
     @property
     def is_deal_of_the_day(self):
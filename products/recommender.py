@@ -1,59 +1,169 @@
-import redis
-from django.conf import settings
-from .models import Product
+import heapq
+import math
+from collections import Counter, defaultdict
+from itertools import combinations
+
+from redis.exceptions import WatchError
 
-# connect to redis-db
-r = redis.Redis(
-    host=settings.REDIS_HOST,
-    port=settings.REDIS_PORT,
-    db=settings.REDIS_DB
-)
+from common.redis_client import redis_connection as r
+from .models import Product
 
 class Recommender(object):
+    suggestions_timeout = 60 * 5
+    # seconds an order is remembered as recorded, longer than its task retries
+    recorded_order_timeout = 60 * 60 * 24 * 30
 
     def get_product_key(self, id):
         return f'product:{id}:purchased_with'
 
-    def products_bought(self, products):
-        product_ids = products
+    def get_neighbours_key(self, id):
+        return f'product:{id}:neighbours'
+
+    def products_bought(self, products, pipe=None):
+        """
+        Increments scores of products bought together, sending all increments
+        to redis in one round-trip (or queueing them on the given pipeline).
+        """
+        # count every product once per order
+        product_ids = [id for id in dict.fromkeys(products) if id is not None]
+        execute = pipe is None
+        if pipe is None:
+            pipe = r.pipeline(transaction=False)
         for product_id in product_ids:
             for with_id in product_ids:
                 # get the other products bought with each product
                 if product_id != with_id:
                     # increment score for product purchased together
-                    r.zincrby(self.get_product_key(product_id), 1, with_id)
+                    pipe.zincrby(self.get_product_key(product_id), 1, with_id)
+        if execute:
+            pipe.execute()
+
+    def get_recorded_order_key(self, order_id):
+        return f'recommender:recorded:{order_id}'
+
+    def order_bought(self, order_id, products):
+        """
+        Records products of an order bought together once, however many
+        times it is called. The order is marked recorded in the same
+        transaction as the increments, so they are applied all or none.
+        """
+        key = self.get_recorded_order_key(order_id)
+        with r.pipeline() as pipe:
+            try:
+                pipe.watch(key)
+                if pipe.exists(key):
+                    return False
+                pipe.multi()
+                pipe.set(key, 1, ex=self.recorded_order_timeout)
+                self.products_bought(products, pipe)
+                pipe.execute()
+            except WatchError:
+                # recorded by a concurrent call
+                return False
+        return True
 
-    def suggest_products_for(self, products, max_results=6):
-        product_ids = products
-        if len(products) == 1:
+    def orders_bought(self, orders, batch_size=500):
+        """
+        Records products bought together for an iterable of orders, each being
+        an iterable of product ids. Used to back-fill scores from order history.
+        """
+        pipe = r.pipeline(transaction=False)
+        for count, products in enumerate(orders, 1):
+            self.products_bought(products, pipe)
+            if count % batch_size == 0:
+                pipe.execute()
+        pipe.execute()
+
+    def get_suggestions_key(self, product_ids):
+        # sorted ids, so the same cart shares one key in any order
+        flat_ids = '_'.join(str(id) for id in sorted(product_ids))
+        return f'suggestions_for:{flat_ids}'
+
+    def suggest_product_ids_for(self, products, max_results=6):
+        product_ids = list({int(id) for id in products})
+        if not product_ids:
+            return []
+        if len(product_ids) == 1:
             # only 1 product
-            suggestions = r.zrange(
+            suggestions = r.zrevrange(
                             self.get_product_key(product_ids[0]),
-                            0, -1,
-                            desc=True
-                        )[:max_results]
+                            0, max_results - 1
+                        )
         else:
-            # generate a temporary key
-            flat_ids = ''.join([str(id) for id in product_ids])
-            tmp_key = f'tmp_{flat_ids}'
-            # multiple products, combine scores of all products
-            # store the resulting sorted set in a temporary key
-            keys = [self.get_product_key(id) for id in product_ids]
-            r.zunionstore(tmp_key, keys)
-            # remove ids for the products the recommendation is for
-            r.zrem(tmp_key, *product_ids)
-            # get the product ids by their score, descendant sort
-            suggestions = r.zrange(tmp_key, 0, -1,
-                                   desc=True)[:max_results]
-            # remove the temporary key
-            r.delete(tmp_key)
-        suggested_products_ids = [int(id) for id in suggestions]
-
-        # get suggested products and sort by order of appearance
-        suggested_products = list(Product.objects.filter(id__in=suggested_products_ids))
-        suggested_products.sort(key=lambda x: suggested_products_ids.index(x.id))
-        return suggested_products, suggested_products_ids
+            # combined scores of multiple products are cached for a while,
+            # repeated carts only read the top of the cached sorted set.
+            suggestions_key = self.get_suggestions_key(product_ids)
+            pipe = r.pipeline(transaction=False)
+            pipe.exists(suggestions_key)
+            pipe.zrevrange(suggestions_key, 0, max_results - 1)
+            is_cached, suggestions = pipe.execute()
+            if not is_cached:
+                keys = [self.get_product_key(id) for id in product_ids]
+                pipe = r.pipeline(transaction=True)
+                # combine scores of all products
+                pipe.zunionstore(suggestions_key, keys)
+                # remove ids for the products the recommendation is for
+                pipe.zrem(suggestions_key, *product_ids)
+                pipe.expire(suggestions_key, self.suggestions_timeout)
+                # get the product ids by their score, descendant sort
+                pipe.zrevrange(suggestions_key, 0, max_results - 1)
+                suggestions = pipe.execute()[-1]
+        return [int(id) for id in suggestions]
+
+    def build_neighbours(self, orders, top_k=20):
+        """
+        Builds item to item co-purchase model from an iterable of orders, each
+        being an iterable of product ids, and publishes top_k neighbours of
+        every product to redis, scored by cosine similarity:
+        orders with both products / sqrt(orders with one * orders with other).
+        """
+        product_orders = Counter()
+        pair_orders = Counter()
+        for products in orders:
+            product_ids = sorted({id for id in products if id is not None})
+            product_orders.update(product_ids)
+            pair_orders.update(combinations(product_ids, 2))
+
+        neighbours = defaultdict(list)
+        for (product_id, with_id), count in pair_orders.items():
+            score = count / math.sqrt(product_orders[product_id] * product_orders[with_id])
+            neighbours[product_id].append((score, with_id))
+            neighbours[with_id].append((score, product_id))
+
+        keys = {self.get_neighbours_key(id) for id in neighbours}
+        # replace all neighbours in one MULTI/EXEC, so readers never see
+        # a product's neighbours deleted but not added yet
+        pipe = r.pipeline(transaction=True)
+        # drop neighbours of products that no longer have any
+        for key in r.scan_iter(match=self.get_neighbours_key('*')):
+            if key.decode() not in keys:
+                pipe.delete(key)
+        for product_id, scores in neighbours.items():
+            key = self.get_neighbours_key(product_id)
+            pipe.delete(key)
+            pipe.zadd(key, {with_id: score for score, with_id in heapq.nlargest(top_k, scores)})
+        pipe.execute()
+        return len(neighbours)
+
+    def suggest_product_ids_for_user(self, products, max_results=6):
+        """
+        Merges precomputed neighbours of products the user has bought,
+        read in one round-trip, and returns ids of the best scored ones.
+        """
+        product_ids = {int(id) for id in products}
+        pipe = r.pipeline(transaction=False)
+        for id in product_ids:
+            pipe.zrange(self.get_neighbours_key(id), 0, -1, withscores=True)
+        scores = Counter()
+        for neighbours in pipe.execute():
+            for with_id, score in neighbours:
+                scores[int(with_id)] += score
+        for id in product_ids:
+            scores.pop(id, None)
+        return [id for id, _ in scores.most_common(max_results)]
 
     def clear_purchases(self):
-        for id in Product.objects.values_list('id', flat=True):
-            r.delete(self.get_product_key(id))
\ No newline at end of file
+        pipe = r.pipeline(transaction=False)
+        for id in Product.objects.values_list('id', flat=True).iterator():
+            pipe.delete(self.get_product_key(id))
+        pipe.execute()
\ No newline at end of file
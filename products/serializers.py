@@ -104,27 +104,23 @@ class ProductSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Product
-        fields = '__all__'
+        exclude = (
+            'search_vector',
+        )
         read_only_fields = (
-            'slug',
+            'slug', 'rating_count', 'one_star_count', 'two_stars_count',
+            'three_stars_count', 'four_stars_count', 'five_stars_count',
         )
 
     def get_rating_per_stars(self, obj):
         """
         Returns dict of ratings and their respective percentage value.
         """
-        rating_count = 1 if obj.reviews.count() == 0 else obj.reviews.count()
-        one_star = obj.reviews.filter(rating=1).count() / rating_count * 100 
-        two_stars = obj.reviews.filter(rating=2).count() / rating_count * 100 
-        three_stars = obj.reviews.filter(rating=3).count() / rating_count * 100 
-        four_stars = obj.reviews.filter(rating=4).count() / rating_count * 100 
-        five_stars = obj.reviews.filter(rating=5).count() / rating_count * 100 
+        rating_counts = obj.get_rating_counts()
+        rating_count = sum(rating_counts.values()) or 1
         return {
-            '1':one_star,
-            '2':two_stars,
-            '3':three_stars,
-            '4':four_stars,
-            '5':five_stars,
+            str(star): count / rating_count * 100
+            for star, count in rating_counts.items()
         }
     
     def get_brand_data(self, obj):
@@ -134,6 +130,32 @@ class ProductSerializer(serializers.ModelSerializer):
         return BrandSerializer(obj.brand).data
 
 
+class ProductCardSerializer(serializers.ModelSerializer):
+    """
+    Serializes Product model instances with fields needed to list them as cards.
+    """
+    brand_name = serializers.CharField(source='brand.name', read_only=True, default=None)
+    sub_category_name = serializers.CharField(source='sub_category.name', read_only=True)
+
+    class Meta:
+        model = Product
+        fields = (
+            'id', 'name', 'slug', 'sku', 'hero_image', 'marked_price',
+            'selling_price', 'average_rating', 'rating_count', 'brand_name',
+            'sub_category_name',
+        )
+        read_only_fields = fields
+
+
+class ProductBoughtTogetherSerializer(serializers.Serializer):
+    """
+    Validates product ids products bought together are asked for.
+    """
+    product_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+    )
+
+
 class ProductImageSerializer(serializers.ModelSerializer):
     """
     Serializes ProductImage model instances.
@@ -0,0 +1,46 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_delete
+from django.dispatch import receiver
+
+from .models import Product
+from .utils import invalidate_similar_products
+
+
+SIMILAR_PRODUCTS_FIELDS = {'name', 'overview', 'sub_category', 'sub_category_id'}
+
+
+@receiver(pre_save, sender=Product)
+def invalidate_similar_products_on_change(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Invalidates cached similar products when a product is added to a
+    sub category or its name, overview or sub category changes.
+    """
+    if raw:
+        return
+    if update_fields is not None and not SIMILAR_PRODUCTS_FIELDS.intersection(update_fields):
+        return
+    previous = None
+    if instance.pk:
+        previous = (
+            Product.objects
+            .filter(pk=instance.pk)
+            .values('name', 'overview', 'sub_category')
+            .first()
+        )
+    if previous is None:
+        sub_category_ids = {instance.sub_category_id}
+    elif (
+        previous['name'] != instance.name or
+        previous['overview'] != instance.overview or
+        previous['sub_category'] != instance.sub_category_id
+    ):
+        sub_category_ids = {previous['sub_category'], instance.sub_category_id}
+    else:
+        return
+    transaction.on_commit(lambda: invalidate_similar_products(*sub_category_ids))
+
+
+@receiver(post_delete, sender=Product)
+def invalidate_similar_products_on_delete(sender, instance, **kwargs):
+    sub_category_id = instance.sub_category_id
+    transaction.on_commit(lambda: invalidate_similar_products(sub_category_id))
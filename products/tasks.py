@@ -0,0 +1,29 @@
+from celery import shared_task
+
+from .counters import ProductViewCounter
+from .recommender import Recommender
+from .utils import get_top_selling_product_ids, get_ordered_product_ids_by_order
+
+
+@shared_task
+def flush_product_views_count():
+    """
+    Writes buffered product views to the database.
+    """
+    return ProductViewCounter().flush()
+
+
+@shared_task
+def refresh_top_selling_products():
+    """
+    Refreshes cached ids of top selling products.
+    """
+    get_top_selling_product_ids(refresh=True)
+
+
+@shared_task
+def build_co_purchase_neighbours():
+    """
+    Rebuilds item to item co-purchase neighbours from order history.
+    """
+    return Recommender().build_neighbours(get_ordered_product_ids_by_order())
@@ -1,7 +1,12 @@
+import time
+from itertools import groupby
+from operator import itemgetter
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist, MultipleObjectsReturned
+from django.db.models import F, Case, When, Value, DecimalField
+from django.db.models.functions import Cast
 from rest_framework import serializers
 from django.contrib.postgres.search import (
-    SearchVector,
     SearchQuery,
     SearchRank
 )
@@ -12,28 +17,133 @@ from .models import (
 from orders.models import OrderProduct
 
 
-def get_similar_products(product_obj):
+RATING_COUNT_FIELDS = {
+    1: 'one_star_count',
+    2: 'two_stars_count',
+    3: 'three_stars_count',
+    4: 'four_stars_count',
+    5: 'five_stars_count',
+}
+
+
+def get_similar_products(product_obj, matching_only=True):
     """
-    Returns similar products.
+    Returns products of the same sub category ranked by similarity of their
+    search vector to product's name. With matching_only only products whose
+    search vector matches the name are returned, so the GIN index is used.
     """
-    search_vector = (
-        SearchVector('name', weight='A') +
-        SearchVector('overview', weight='B')
-    )
     query = product_obj.name
     search_query = SearchQuery(query)
+    queryset = Product.objects.for_listing().filter(
+        sub_category_id=product_obj.sub_category_id,
+    )
+    if matching_only:
+        queryset = queryset.filter(search_vector=search_query)
     queryset = (
-        Product.objects.filter(
-            sub_category=product_obj.sub_category,
-        ).
-        annotate(
-            rank=SearchRank(search_vector, search_query)
+        queryset
+        .annotate(
+            rank=SearchRank(F('search_vector'), search_query)
         )
         .order_by('-rank')
     )
     return queryset
 
 
+SIMILAR_PRODUCTS_LIMIT = 20
+SIMILAR_PRODUCTS_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def get_similar_products_version_key(sub_category_id):
+    return f'similar_products:{sub_category_id}:version'
+
+
+def get_similar_product_ids(product_obj):
+    """
+    Returns ids of top similar products (product itself included) from cache,
+    ranking them on cache miss.
+    """
+    version = cache.get_or_set(
+        get_similar_products_version_key(product_obj.sub_category_id),
+        time.time_ns,
+        None
+    )
+    cache_key = f'similar_products:{product_obj.sub_category_id}:{version}:{product_obj.pk}'
+    similar_product_ids = cache.get(cache_key)
+    if similar_product_ids is None:
+        similar_product_ids = list(
+            get_similar_products(product_obj)
+            .values_list('id', flat=True)[:SIMILAR_PRODUCTS_LIMIT + 1]
+        )
+        if not similar_product_ids:
+            # name made of stop words only matches nothing, rank whole sub category
+            similar_product_ids = list(
+                get_similar_products(product_obj, matching_only=False)
+                .values_list('id', flat=True)[:SIMILAR_PRODUCTS_LIMIT + 1]
+            )
+        cache.set(cache_key, similar_product_ids, SIMILAR_PRODUCTS_CACHE_TIMEOUT)
+    return similar_product_ids
+
+
+def get_cached_similar_products(product_obj):
+    """
+    Returns similar products ordered by rank, loaded with a single query.
+    """
+    similar_product_ids = get_similar_product_ids(product_obj)
+    products = Product.objects.for_listing().in_bulk(similar_product_ids)
+    return [
+        products[product_id] for product_id in similar_product_ids
+        if product_id in products
+    ]
+
+
+def invalidate_similar_products(*sub_category_ids):
+    """
+    Discards cached similar products of all products in given sub categories.
+    """
+    cache.set_many(
+        {
+            get_similar_products_version_key(sub_category_id): time.time_ns()
+            for sub_category_id in sub_category_ids
+        },
+        None
+    )
+
+
+TOP_SELLING_PRODUCTS_LIMIT = 50
+TOP_SELLING_PRODUCTS_CACHE_KEY = 'products:top_selling_ids'
+
+
+def get_top_selling_product_ids(refresh=False):
+    """
+    Returns ids of top selling products, cached and refreshed periodically
+    by products.tasks.refresh_top_selling_products.
+    """
+    top_selling_product_ids = None if refresh else cache.get(TOP_SELLING_PRODUCTS_CACHE_KEY)
+    if top_selling_product_ids is None:
+        top_selling_product_ids = list(
+            Product.objects
+            .order_by('-items_sold', '-id')
+            .values_list('id', flat=True)[:TOP_SELLING_PRODUCTS_LIMIT]
+        )
+        cache.set(TOP_SELLING_PRODUCTS_CACHE_KEY, top_selling_product_ids, 60 * 60)
+    return top_selling_product_ids
+
+
+def get_ordered_product_ids_by_order():
+    """
+    Streams lists of product ids ordered together, one list per order.
+    """
+    ordered_products = (
+        OrderProduct.objects
+        .filter(product__isnull=False)
+        .order_by('order')
+        .values_list('order', 'product')
+        .iterator(chunk_size=2000)
+    )
+    for _, order_products in groupby(ordered_products, key=itemgetter(0)):
+        yield [product_id for _, product_id in order_products]
+
+
 def get_ordered_product_obj(ordered_product_id):
     """
     Raises validation error or returns ordered_product_obj.
@@ -85,4 +195,42 @@ def get_product_bundle_for_pre_order_obj(product_bundle_for_pre_order_id):
             },
             code='invalid_product_bundle_for_pre_order_id'
         )
-    return product_bundle_for_pre_order_obj
\ No newline at end of file
+    return product_bundle_for_pre_order_obj
+
+
+def get_average_rating_expression():
+    """
+    Returns expression that calculates average rating from product's rating counters.
+    """
+    rating_sum = sum(
+        F(field_name) * star for star, field_name in RATING_COUNT_FIELDS.items()
+    )
+    return Case(
+        When(rating_count=0, then=Value(5)),
+        default=Cast(rating_sum, DecimalField(max_digits=12, decimal_places=2)) / F('rating_count'),
+        output_field=DecimalField(max_digits=3, decimal_places=2),
+    )
+
+
+def update_product_rating_stats(product_id, added_rating=None, removed_rating=None):
+    """
+    Updates product's rating counters and average rating after a review is
+    created (added_rating), deleted (removed_rating) or its rating is changed (both).
+    Call it inside the transaction that writes the review.
+    """
+    if added_rating == removed_rating:
+        return
+    updates = {}
+    if added_rating is not None:
+        field_name = RATING_COUNT_FIELDS[added_rating]
+        updates[field_name] = F(field_name) + 1
+    if removed_rating is not None:
+        field_name = RATING_COUNT_FIELDS[removed_rating]
+        updates[field_name] = F(field_name) - 1
+    rating_count_delta = (added_rating is not None) - (removed_rating is not None)
+    if rating_count_delta:
+        updates['rating_count'] = F('rating_count') + rating_count_delta
+
+    products = Product.objects.filter(pk=product_id)
+    products.update(**updates)
+    products.update(average_rating=get_average_rating_expression())
@@ -1,14 +1,16 @@
 
 from django.core.exceptions import ObjectDoesNotExist
-from django.db.models import ProtectedError
+from django.db import transaction
+from django.db.models import ProtectedError, Prefetch
 from django_filters.rest_framework import DjangoFilterBackend
+from redis.exceptions import RedisError
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django.db.models import Avg, Max, Min
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
-from rest_framework.generics import ListAPIView
+from rest_framework.generics import ListAPIView, GenericAPIView
 from rest_framework.views import APIView
 from rest_framework.permissions import (
     IsAuthenticated,
@@ -33,7 +35,7 @@ from .models import (
     FeaturedProduct,
     Offer,
 )
-from .filters import ProductFilterSet
+from .filters import ProductFilterSet, ProductSearchFilter
 from .permissions import(
     IsOwnerOrReadOnly,
     IsAdminUserOrReadOnly,
@@ -55,13 +57,21 @@ from .serializers import (
     ProductBannerSerializer,
     FeaturedProductSerializer,
     OfferSerializer,
+    ProductCardSerializer,
+    ProductBoughtTogetherSerializer,
 )
 from .utils import (
-    get_similar_products,
+    get_cached_similar_products,
     get_ordered_product_obj,
     get_product_obj,
+    update_product_rating_stats,
+    get_top_selling_product_ids,
 )
 from .recommender import Recommender
+from .counters import ProductViewCounter
+
+
+RECOMMENDED_PRODUCTS_LIMIT = 50
 
 
 class CategoryAPIViewSet(ModelViewSet):
@@ -136,13 +146,9 @@ class ProductAPIViewSet(ModelViewSet):
     APIViewSet to manage products.
     """
     serializer_class = ProductSerializer
-    queryset = Product.objects.all().order_by('-id')
+    queryset = Product.objects.for_listing().order_by('-id')
     permission_classes = (IsAdminUserOrReadOnly,)
-    filter_backends = (DjangoFilterBackend, SearchFilter, OrderingFilter)
-    search_fields = (
-        'name', 'overview', 'slug', 'sub_category__name',
-        'sub_category__description',
-    )
+    filter_backends = (DjangoFilterBackend, ProductSearchFilter, OrderingFilter)
     filterset_class = ProductFilterSet
     ordering_fields = (
         'items_sold', 'selling_price', 'created_on',
@@ -152,10 +158,14 @@ class ProductAPIViewSet(ModelViewSet):
     def retrieve(self, request, *args, **kwargs):
         """
         Retrieve a model instance and increase views_count by 1.
+        views are buffered and periodically flushed to views_count.
         """
         instance = self.get_object()
-        instance.views_count += 1
-        instance.save()
+        try:
+            ProductViewCounter().increment(instance.pk)
+        except RedisError:
+            # losing a view is better than failing the product page
+            pass
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
 
@@ -245,7 +255,7 @@ class CompareSimilarProductsListAPIView(ListAPIView):
                 status.HTTP_406_NOT_ACCEPTABLE
             )
         
-        queryset = get_similar_products(product_obj)[:3]      
+        queryset = get_cached_similar_products(product_obj)[:3]      
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -277,7 +287,7 @@ class SimilarProductsListAPIView(ListAPIView):
                 status.HTTP_406_NOT_ACCEPTABLE
             )
         
-        similar_products = get_similar_products(product_obj)
+        similar_products = get_cached_similar_products(product_obj)
         queryset = similar_products[1:]        
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
@@ -325,36 +335,36 @@ class RatingAndReviewAPIViewSet(ModelViewSet):
 
     def perform_create(self, serializer):
         ordered_product_obj = serializer.validated_data.get('ordered_product_obj')
-        review_obj = RatingAndReview.objects.create(
-            user=self.request.user,
-            product = ordered_product_obj.product,
-            rating=serializer.validated_data.get('rating', 5),
-            review = serializer.validated_data.get('review'),
-            image = serializer.validated_data.get('image')
-        )         
-        ordered_product_obj.reviews = review_obj
-        ordered_product_obj.to_be_reviewed=False
-        ordered_product_obj.save()
-
-        self.set_average_rating(ordered_product_obj.product)
-    
-    def set_average_rating(self, product_obj):
-        average_rating = product_obj.reviews.aggregate(average_rating=Avg('rating')).get('average_rating', 5)
-        average_rating = average_rating if average_rating else 5
-        product_obj.average_rating = average_rating
-        product_obj.save()
+        with transaction.atomic():
+            review_obj = RatingAndReview.objects.create(
+                user=self.request.user,
+                product = ordered_product_obj.product,
+                rating=serializer.validated_data.get('rating', 5),
+                review = serializer.validated_data.get('review'),
+                image = serializer.validated_data.get('image')
+            )         
+            ordered_product_obj.reviews = review_obj
+            ordered_product_obj.to_be_reviewed=False
+            ordered_product_obj.save()
+
+            update_product_rating_stats(review_obj.product_id, added_rating=review_obj.rating)
 
     def perform_update(self, serializer):
-        serializer.save()
-        product_obj = self.get_object().product
-        self.set_average_rating(product_obj)
+        previous_rating = serializer.instance.rating
+        with transaction.atomic():
+            review_obj = serializer.save()
+            update_product_rating_stats(
+                review_obj.product_id,
+                added_rating=review_obj.rating,
+                removed_rating=previous_rating,
+            )
     
     def perform_destroy(self, instance):
-        instance.on_ordered_product.to_be_reviewed=True
-        instance.on_ordered_product.save()
-        instance.delete()
-        product_obj = instance.product
-        self.set_average_rating(product_obj)
+        with transaction.atomic():
+            instance.on_ordered_product.to_be_reviewed=True
+            instance.on_ordered_product.save()
+            instance.delete()
+            update_product_rating_stats(instance.product_id, removed_rating=instance.rating)
 
 
 class MarkProductAsFeaturedAPIView(APIView):
@@ -441,7 +451,9 @@ class DealOfTheDayProductAPIViewSet(ModelViewSet):
             queryset= DealOfTheDay.objects.filter(
                 start_date__gt=timezone.now().date()
             )      
-        return queryset
+        return queryset.prefetch_related(
+            Prefetch('product', queryset=Product.objects.for_listing())
+        )
     
         def get_serializer_context(self):
             """
@@ -457,7 +469,9 @@ class TodaysPopularPickProductAPIViewSet(ModelViewSet):
     APIViewSet that manages today's popular pick products.
     """
     serializer_class = PopularPickSerializer
-    queryset = PopularPick.objects.all()
+    queryset = PopularPick.objects.prefetch_related(
+        Prefetch('product', queryset=Product.objects.for_listing())
+    )
     permission_classes = (IsAdminUserOrReadOnly,)
     filter_backends = (DjangoFilterBackend, OrderingFilter)
     filterset_fields = ('is_active',)
@@ -567,7 +581,9 @@ class OfferAPIViewSet(ModelViewSet):
             queryset= Offer.objects.filter(
                 start_date__gt=timezone.now().date()
             )      
-        return queryset
+        return queryset.prefetch_related(
+            Prefetch('products', queryset=Product.objects.for_listing())
+        )
     
         def get_serializer_context(self):
             """
@@ -578,7 +594,27 @@ class OfferAPIViewSet(ModelViewSet):
             }
 
 
-class ProductBoughtTogetherAPIView(APIView):
+class RecommendedProductsMixin(object):
+    """
+    Mixin that returns a page of suggested products followed by top selling
+    products, capped to RECOMMENDED_PRODUCTS_LIMIT.
+    """
+    serializer_class = ProductCardSerializer
+
+    def get_recommended_products_response(self, suggested_products_ids=()):
+        product_ids = list(
+            dict.fromkeys([*suggested_products_ids, *get_top_selling_product_ids()])
+        )[:RECOMMENDED_PRODUCTS_LIMIT]
+        page_product_ids = self.paginate_queryset(product_ids)
+        products = Product.objects.for_listing().in_bulk(page_product_ids)
+        serializer = self.get_serializer(
+            [products[id] for id in page_product_ids if id in products],
+            many=True
+        )
+        return self.get_paginated_response(serializer.data)
+
+
+class ProductBoughtTogetherAPIView(RecommendedProductsMixin, GenericAPIView):
     """
     APIView that returns products that are bought together.
     """
@@ -591,58 +627,36 @@ class ProductBoughtTogetherAPIView(APIView):
                 },
                 status.HTTP_400_BAD_REQUEST
             )
+        serializer = ProductBoughtTogetherSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
 
-        top_selling_products = Product.objects.order_by('-items_sold')
-        if product_ids == []:
-            return Response(
-                {
-                    'data': ProductSerializer(top_selling_products, many=True).data
-                },
-                status.HTTP_200_OK
-            )
-            
         recommender = Recommender()
-        suggested_products, suggested_products_ids = recommender.suggest_products_for(product_ids)
-        suggested_products += top_selling_products.exclude(id__in=suggested_products_ids)
-        return Response(
-            {
-                'data': ProductSerializer(suggested_products, many=True).data,
-            },
-            status.HTTP_200_OK
+        suggested_products_ids = recommender.suggest_product_ids_for(
+            serializer.validated_data['product_ids']
         )
+        return self.get_recommended_products_response(suggested_products_ids)
 
 
-class RecommendedProductsAPIView(APIView):
+class RecommendedProductsAPIView(RecommendedProductsMixin, GenericAPIView):
     """
     APIView that returns recommended products according to what the user has bought
     previously, otherwise top selling products.
     """
     def get(self, request, *args, **kwargs):
         user = self.request.user
-        top_selling_products = Product.objects.order_by('-items_sold')
         if user.is_anonymous:
-            return Response(
-                {
-                    'data': ProductSerializer(top_selling_products, many=True).data
-                }
-            )
-
-        product_ids = [user.ordered_products.values_list('product', flat=True)]
-        if product_ids == []:
-            return Response(
-                {
-                    'data': ProductSerializer(top_selling_products, many=True).data
-                },
-                status.HTTP_200_OK
-            )
-        
+            return self.get_recommended_products_response()
+
+        # products from the most recent orders
+        product_ids = list(dict.fromkeys(
+            user.ordered_products
+            .filter(product__isnull=False)
+            .order_by('-created_on')
+            .values_list('product', flat=True)[:100]
+        ))[:20]
         recommender = Recommender()
-        suggested_products, suggested_products_ids = recommender.suggest_products_for(product_ids)
-        suggested_products += top_selling_products.exclude(id__in=suggested_products_ids)
-        return Response(
-            {
-                'data': ProductSerializer(suggested_products, many=True).data,
-            },
-            status.HTTP_200_OK
+        suggested_products_ids = recommender.suggest_product_ids_for_user(
+            product_ids,
+            max_results=RECOMMENDED_PRODUCTS_LIMIT
         )
-        
\ No newline at end of file
+        return self.get_recommended_products_response(suggested_products_ids)